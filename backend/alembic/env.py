@@ -1,4 +1,5 @@
 import os
+import re
 from logging.config import fileConfig
 from sqlalchemy import engine_from_config
 from sqlalchemy import pool
@@ -22,6 +23,19 @@ import app.models  # noqa: F401
 
 target_metadata = Base.metadata
 
+_PARTITION_NAME = re.compile(r"^attendance_records_(\d{4}_\d{2}|default)$")
+
+def include_object(object, name, type_, reflected, compare_to):
+    # raw DDL objects (app.models.EMPLOYEE_SEARCH_DDL, ATTENDANCE_DESC_SORT_DDL), not metadata
+    if reflected and compare_to is None and name and (
+        name.startswith("employees_fts") or name == "ix_employees_search_trgm" or name.endswith("_desc")
+    ):
+        return False
+    # monthly partitions of attendance_records (app.partitions), attached or detached
+    if reflected and compare_to is None and type_ == "table" and _PARTITION_NAME.match(name or ""):
+        return False
+    return True
+
 def get_url():
     # Prefer DATABASE_URL env var (set by .env when docker compose starts)
     return os.getenv("DATABASE_URL", settings.DATABASE_URL)
@@ -30,6 +44,7 @@ def run_migrations_offline():
     url = get_url()
     context.configure(
         url=url, target_metadata=target_metadata, literal_binds=True,
+        include_object=include_object,
         dialect_opts={"paramstyle": "named"}
     )
     with context.begin_transaction():
@@ -45,7 +60,8 @@ def run_migrations_online():
     )
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata,
+            include_object=include_object,
         )
         with context.begin_transaction():
             context.run_migrations()
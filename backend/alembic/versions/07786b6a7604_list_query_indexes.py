@@ -0,0 +1,39 @@
+"""list query indexes
+
+Revision ID: 07786b6a7604
+Revises: d178c715042f
+Create Date: 2026-10-17 10:02:17.554903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '07786b6a7604'
+down_revision: Union[str, None] = 'd178c715042f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # /attendance/list: date range + default date sort, per-employee check-in/out sorts
+    op.create_index('ix_attendance_records_date_id', 'attendance_records', ['date', 'id'], unique=False)
+    op.create_index('ix_attendance_records_emp_check_in', 'attendance_records', ['employee_id', 'check_in_time', 'id'], unique=False)
+    op.create_index('ix_attendance_records_emp_check_out', 'attendance_records', ['employee_id', 'check_out_time', 'id'], unique=False)
+    # /leave/list: per-employee and company-wide, newest first
+    op.create_index('ix_leave_requests_emp_applied', 'leave_requests', ['employee_id', 'applied_at'], unique=False, postgresql_include=['status'])
+    op.create_index('ix_leave_requests_applied', 'leave_requests', ['applied_at'], unique=False)
+    # /holidays/list
+    op.create_index(op.f('ix_holidays_date'), 'holidays', ['date'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_holidays_date'), table_name='holidays')
+    op.drop_index('ix_leave_requests_applied', table_name='leave_requests')
+    op.drop_index('ix_leave_requests_emp_applied', table_name='leave_requests')
+    op.drop_index('ix_attendance_records_emp_check_out', table_name='attendance_records')
+    op.drop_index('ix_attendance_records_emp_check_in', table_name='attendance_records')
+    op.drop_index('ix_attendance_records_date_id', table_name='attendance_records')
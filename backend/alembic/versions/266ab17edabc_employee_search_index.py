@@ -0,0 +1,61 @@
+"""employee search index
+
+Revision ID: 266ab17edabc
+Revises: 07786b6a7604
+Create Date: 2026-10-17 11:20:48.904512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '266ab17edabc'
+down_revision: Union[str, None] = '07786b6a7604'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_DOCUMENT = (
+    "lower(coalesce(first_name, '') || ' ' || coalesce(last_name, '') || ' ' || coalesce(email, '')"
+    " || ' ' || coalesce(phone, '') || ' ' || coalesce(designation, ''))"
+)
+COLS = "first_name, last_name, email, phone, designation"
+NEW_COLS = "new.first_name, new.last_name, new.email, new.phone, new.designation"
+OLD_COLS = "old.first_name, old.last_name, old.email, old.phone, old.designation"
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute(f"CREATE INDEX IF NOT EXISTS ix_employees_search_trgm ON employees USING gin (({SEARCH_DOCUMENT}) gin_trgm_ops)")
+    elif dialect == "sqlite":
+        op.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS employees_fts USING fts5({COLS}, content='employees', content_rowid='id')")
+        op.execute(
+            f"CREATE TRIGGER IF NOT EXISTS employees_fts_ai AFTER INSERT ON employees BEGIN "
+            f"INSERT INTO employees_fts(rowid, {COLS}) VALUES (new.id, {NEW_COLS}); END"
+        )
+        op.execute(
+            f"CREATE TRIGGER IF NOT EXISTS employees_fts_ad AFTER DELETE ON employees BEGIN "
+            f"INSERT INTO employees_fts(employees_fts, rowid, {COLS}) VALUES ('delete', old.id, {OLD_COLS}); END"
+        )
+        op.execute(
+            f"CREATE TRIGGER IF NOT EXISTS employees_fts_au AFTER UPDATE ON employees BEGIN "
+            f"INSERT INTO employees_fts(employees_fts, rowid, {COLS}) VALUES ('delete', old.id, {OLD_COLS}); "
+            f"INSERT INTO employees_fts(rowid, {COLS}) VALUES (new.id, {NEW_COLS}); END"
+        )
+        # index the rows that already exist
+        op.execute("INSERT INTO employees_fts(employees_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_employees_search_trgm")
+    elif dialect == "sqlite":
+        op.execute("DROP TRIGGER IF EXISTS employees_fts_au")
+        op.execute("DROP TRIGGER IF EXISTS employees_fts_ad")
+        op.execute("DROP TRIGGER IF EXISTS employees_fts_ai")
+        op.execute("DROP TABLE IF EXISTS employees_fts")
@@ -0,0 +1,110 @@
+"""partition attendance_records by month (PostgreSQL)
+
+Revision ID: 4e0c25b8c47c
+Revises: 9c41d2e7ab30
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4e0c25b8c47c'
+down_revision: Union[str, None] = '9c41d2e7ab30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# partitions created past the current month; manage_partitions.py keeps this up
+MONTHS_AHEAD = 3
+
+COLUMNS = "id, employee_id, date, check_in_time, check_out_time, status"
+
+# constraints and indexes of attendance_records as of the previous revisions
+INDEXES = [
+    "CREATE INDEX ix_attendance_records_id ON attendance_records (id)",
+    "CREATE INDEX ix_attendance_records_date_id ON attendance_records (date, id)",
+    "CREATE INDEX ix_attendance_records_emp_check_in ON attendance_records (employee_id, check_in_time, id)",
+    "CREATE INDEX ix_attendance_records_emp_check_out ON attendance_records (employee_id, check_out_time, id)",
+    "CREATE INDEX ix_attendance_records_emp_check_in_desc "
+    "ON attendance_records (employee_id, check_in_time DESC NULLS LAST, id DESC)",
+    "CREATE INDEX ix_attendance_records_emp_check_out_desc "
+    "ON attendance_records (employee_id, check_out_time DESC NULLS LAST, id DESC)",
+]
+
+
+def _constraints(pk_columns: str):
+    return [
+        f"ALTER TABLE attendance_records ADD CONSTRAINT attendance_records_pkey PRIMARY KEY ({pk_columns})",
+        "ALTER TABLE attendance_records ADD CONSTRAINT _emp_date_uc UNIQUE (employee_id, date)",
+        "ALTER TABLE attendance_records ADD CONSTRAINT attendance_records_employee_id_fkey "
+        "FOREIGN KEY (employee_id) REFERENCES employees (id)",
+    ]
+
+
+def _table_sql(name: str, suffix: str = "") -> str:
+    return (
+        f"CREATE TABLE {name} ("
+        "id integer NOT NULL DEFAULT nextval('attendance_records_id_seq'), "
+        "employee_id integer NOT NULL, "
+        "date date NOT NULL, "
+        "check_in_time timestamp with time zone, "
+        "check_out_time timestamp with time zone, "
+        f"status varchar(30)){suffix}"
+    )
+
+
+def _next_month(year: int, month: int):
+    return (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def _swap_in(new_table: str, pk_columns: str):
+    """Copy attendance_records into new_table and put new_table in its place."""
+    op.execute(f"INSERT INTO {new_table} ({COLUMNS}) SELECT {COLUMNS} FROM attendance_records")
+    op.execute("DROP TABLE attendance_records")
+    op.execute(f"ALTER TABLE {new_table} RENAME TO attendance_records")
+    op.execute("ALTER SEQUENCE attendance_records_id_seq OWNED BY attendance_records.id")
+    for stmt in _constraints(pk_columns) + INDEXES:
+        op.execute(stmt)
+
+
+def upgrade() -> None:
+    # SQLite has no declarative partitioning; the table stays as it is there
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+    # the copy below rewrites the table under an ACCESS EXCLUSIVE lock: run it in a maintenance window
+    op.execute("ALTER SEQUENCE attendance_records_id_seq OWNED BY NONE")
+    # every unique constraint on a partitioned table must include the partition key
+    op.execute(_table_sql("attendance_records_partitioned", " PARTITION BY RANGE (date)"))
+
+    first, last = bind.execute(sa.text("SELECT min(date), max(date) FROM attendance_records")).first()
+    today = date.today()
+    first = min(first or today, today)
+    last = max(last or today, today)
+    last_year, last_month = last.year, last.month
+    for _ in range(MONTHS_AHEAD):
+        last_year, last_month = _next_month(last_year, last_month)
+    year, month = first.year, first.month
+    while (year, month) <= (last_year, last_month):
+        ny, nm = _next_month(year, month)
+        op.execute(
+            f"CREATE TABLE attendance_records_{year:04d}_{month:02d} PARTITION OF attendance_records_partitioned "
+            f"FOR VALUES FROM ('{year:04d}-{month:02d}-01') TO ('{ny:04d}-{nm:02d}-01')"
+        )
+        year, month = ny, nm
+    op.execute("CREATE TABLE attendance_records_default PARTITION OF attendance_records_partitioned DEFAULT")
+
+    _swap_in("attendance_records_partitioned", "id, date")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("ALTER SEQUENCE attendance_records_id_seq OWNED BY NONE")
+    op.execute(_table_sql("attendance_records_plain"))
+    # dropping the partitioned parent drops its attached partitions; detached ones are left alone
+    _swap_in("attendance_records_plain", "id")
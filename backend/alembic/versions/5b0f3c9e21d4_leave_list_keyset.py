@@ -0,0 +1,43 @@
+"""leave list keyset indexes
+
+Revision ID: 5b0f3c9e21d4
+Revises: 266ab17edabc
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b0f3c9e21d4'
+down_revision: Union[str, None] = '266ab17edabc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # /leave/list pages by (applied_at, id); NOT NULL lets the indexes serve DESC without a NULLS clause
+    op.execute("UPDATE leave_requests SET applied_at = CURRENT_TIMESTAMP WHERE applied_at IS NULL")
+    op.drop_index('ix_leave_requests_applied', table_name='leave_requests')
+    op.drop_index('ix_leave_requests_emp_applied', table_name='leave_requests')
+    with op.batch_alter_table('leave_requests') as batch_op:
+        batch_op.alter_column('applied_at', existing_type=sa.DateTime(timezone=True), nullable=False,
+                              existing_server_default=sa.text('(CURRENT_TIMESTAMP)'))
+    op.create_index('ix_leave_requests_emp_applied', 'leave_requests', ['employee_id', 'applied_at', 'id'], unique=False, postgresql_include=['status'])
+    op.create_index('ix_leave_requests_applied', 'leave_requests', ['applied_at', 'id'], unique=False)
+    # /leave/list?status=...: admin inbox, newest first
+    op.create_index('ix_leave_requests_status_applied', 'leave_requests', ['status', 'applied_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_leave_requests_status_applied', table_name='leave_requests')
+    op.drop_index('ix_leave_requests_applied', table_name='leave_requests')
+    op.drop_index('ix_leave_requests_emp_applied', table_name='leave_requests')
+    with op.batch_alter_table('leave_requests') as batch_op:
+        batch_op.alter_column('applied_at', existing_type=sa.DateTime(timezone=True), nullable=True,
+                              existing_server_default=sa.text('(CURRENT_TIMESTAMP)'))
+    op.create_index('ix_leave_requests_emp_applied', 'leave_requests', ['employee_id', 'applied_at'], unique=False, postgresql_include=['status'])
+    op.create_index('ix_leave_requests_applied', 'leave_requests', ['applied_at'], unique=False)
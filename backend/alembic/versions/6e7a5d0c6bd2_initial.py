@@ -20,11 +20,106 @@ depends_on: Union[str, Sequence[str], None] = None
 
 def upgrade() -> None:
     # ### commands auto generated by Alembic - please adjust! ###
-    pass
+    op.create_table('departments',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=128), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    op.create_index(op.f('ix_departments_id'), 'departments', ['id'], unique=False)
+    op.create_table('holidays',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=200), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('description', sa.String(length=500), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_holidays_id'), 'holidays', ['id'], unique=False)
+    op.create_table('leave_types',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=80), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    op.create_table('employees',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('first_name', sa.String(length=120), nullable=False),
+    sa.Column('last_name', sa.String(length=120), nullable=True),
+    sa.Column('email', sa.String(length=200), nullable=False),
+    sa.Column('password_hash', sa.String(length=200), nullable=False),
+    sa.Column('phone', sa.String(length=30), nullable=True),
+    sa.Column('designation', sa.String(length=120), nullable=True),
+    sa.Column('role', sa.Enum('admin', 'manager', 'employee', name='roleenum'), nullable=False),
+    sa.Column('department_id', sa.Integer(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['department_id'], ['departments.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_employees_email'), 'employees', ['email'], unique=True)
+    op.create_index(op.f('ix_employees_id'), 'employees', ['id'], unique=False)
+    op.create_table('attendance_records',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('employee_id', sa.Integer(), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('check_in_time', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('check_out_time', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('status', sa.String(length=30), nullable=True),
+    sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('employee_id', 'date', name='_emp_date_uc')
+    )
+    op.create_index(op.f('ix_attendance_records_id'), 'attendance_records', ['id'], unique=False)
+    op.create_table('leave_balance',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('employee_id', sa.Integer(), nullable=False),
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('total_leaves', sa.Integer(), nullable=False),
+    sa.Column('used_leaves', sa.Integer(), nullable=False),
+    sa.Column('remaining_leaves', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('employee_id', 'year', name='_emp_year_uc')
+    )
+    op.create_index(op.f('ix_leave_balance_id'), 'leave_balance', ['id'], unique=False)
+    op.create_table('leave_requests',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('employee_id', sa.Integer(), nullable=False),
+    sa.Column('leave_type_id', sa.Integer(), nullable=False),
+    sa.Column('start_date', sa.Date(), nullable=False),
+    sa.Column('end_date', sa.Date(), nullable=False),
+    sa.Column('reason', sa.String(length=700), nullable=True),
+    sa.Column('status', sa.Enum('pending', 'approved', 'rejected', name='leavestatus'), nullable=True),
+    sa.Column('reviewed_by', sa.Integer(), nullable=True),
+    sa.Column('applied_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column('reviewed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], ),
+    sa.ForeignKeyConstraint(['leave_type_id'], ['leave_types.id'], ),
+    sa.ForeignKeyConstraint(['reviewed_by'], ['employees.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_leave_requests_id'), 'leave_requests', ['id'], unique=False)
     # ### end Alembic commands ###
 
 
 def downgrade() -> None:
     # ### commands auto generated by Alembic - please adjust! ###
-    pass
+    op.drop_index(op.f('ix_leave_requests_id'), table_name='leave_requests')
+    op.drop_table('leave_requests')
+    op.drop_index(op.f('ix_leave_balance_id'), table_name='leave_balance')
+    op.drop_table('leave_balance')
+    op.drop_index(op.f('ix_attendance_records_id'), table_name='attendance_records')
+    op.drop_table('attendance_records')
+    op.drop_index(op.f('ix_employees_id'), table_name='employees')
+    op.drop_index(op.f('ix_employees_email'), table_name='employees')
+    op.drop_table('employees')
+    op.drop_table('leave_types')
+    op.drop_index(op.f('ix_holidays_id'), table_name='holidays')
+    op.drop_table('holidays')
+    op.drop_index(op.f('ix_departments_id'), table_name='departments')
+    op.drop_table('departments')
+    sa.Enum(name='leavestatus').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='roleenum').drop(op.get_bind(), checkfirst=True)
     # ### end Alembic commands ###
@@ -0,0 +1,47 @@
+"""list sort indexes
+
+Revision ID: 9c41d2e7ab30
+Revises: 5b0f3c9e21d4
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c41d2e7ab30'
+down_revision: Union[str, None] = '5b0f3c9e21d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # /employees/list?sort_by=...
+    op.create_index('ix_employees_first_name', 'employees', ['first_name'], unique=False)
+    op.create_index('ix_employees_last_name', 'employees', ['last_name'], unique=False)
+    op.create_index('ix_employees_designation', 'employees', ['designation'], unique=False)
+    op.create_index('ix_employees_created_at', 'employees', ['created_at'], unique=False)
+    # /attendance/list descending check-in/out sorts are DESC NULLS LAST; PostgreSQL needs
+    # indexes in that order (same as app.models.ATTENDANCE_DESC_SORT_DDL)
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_attendance_records_emp_check_in_desc "
+            "ON attendance_records (employee_id, check_in_time DESC NULLS LAST, id DESC)"
+        )
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_attendance_records_emp_check_out_desc "
+            "ON attendance_records (employee_id, check_out_time DESC NULLS LAST, id DESC)"
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_attendance_records_emp_check_out_desc")
+        op.execute("DROP INDEX IF EXISTS ix_attendance_records_emp_check_in_desc")
+    op.drop_index('ix_employees_created_at', table_name='employees')
+    op.drop_index('ix_employees_designation', table_name='employees')
+    op.drop_index('ix_employees_last_name', table_name='employees')
+    op.drop_index('ix_employees_first_name', table_name='employees')
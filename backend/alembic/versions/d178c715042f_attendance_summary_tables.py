@@ -0,0 +1,54 @@
+"""attendance summary tables
+
+Revision ID: d178c715042f
+Revises: 6e7a5d0c6bd2
+Create Date: 2026-10-17 09:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd178c715042f'
+down_revision: Union[str, None] = '6e7a5d0c6bd2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'attendance_daily_summary',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('employee_id', sa.Integer(), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('worked_seconds', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['employee_id'], ['employees.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('employee_id', 'date', name='_daily_summary_emp_date_uc'),
+    )
+    op.create_index(op.f('ix_attendance_daily_summary_id'), 'attendance_daily_summary', ['id'], unique=False)
+    op.create_table(
+        'attendance_monthly_summary',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('employee_id', sa.Integer(), nullable=False),
+        sa.Column('year', sa.Integer(), nullable=False),
+        sa.Column('month', sa.Integer(), nullable=False),
+        sa.Column('present_days', sa.Integer(), nullable=False),
+        sa.Column('late_days', sa.Integer(), nullable=False),
+        sa.Column('absent_days', sa.Integer(), nullable=False),
+        sa.Column('worked_seconds', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['employee_id'], ['employees.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('employee_id', 'year', 'month', name='_monthly_summary_emp_month_uc'),
+    )
+    op.create_index(op.f('ix_attendance_monthly_summary_id'), 'attendance_monthly_summary', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_attendance_monthly_summary_id'), table_name='attendance_monthly_summary')
+    op.drop_table('attendance_monthly_summary')
+    op.drop_index(op.f('ix_attendance_daily_summary_id'), table_name='attendance_daily_summary')
+    op.drop_table('attendance_daily_summary')
@@ -0,0 +1,105 @@
+"""
+Absence job: give every working day an attendance row.
+
+check_in only writes a row when someone turns up, so days without a punch have
+no row at all. fill_absences() writes the missing (employee, day) rows for past
+weekdays as HOLIDAY (a holiday), ON_LEAVE (inside an approved leave request) or
+ABSENT (anything else). It is one INSERT ... SELECT per department and month
+over employees x that month's weekdays, with ON CONFLICT DO NOTHING on
+_emp_date_uc, so days that already have a row (punches, earlier runs) are left
+alone and the job can be re-run freely. The touched months' summaries are
+rebuilt afterwards so absent_days follows.
+"""
+from datetime import date, timedelta
+
+from sqlalchemy import Date, String, case, exists, func, literal, select, true, union_all
+
+from app import archive, holiday_calendar, models
+from app.database import dialect_insert
+from app.summaries import refresh_month
+
+ABSENT = "ABSENT"
+ON_LEAVE = "ON_LEAVE"
+HOLIDAY = "HOLIDAY"
+
+
+def working_days(start: date, end: date):
+    """Mon-Fri days in [start, end]."""
+    day = start
+    while day <= end:
+        if day.weekday() < 5:
+            yield day
+        day += timedelta(days=1)
+
+
+def _days_table(days, cal):
+    """(day, is_holiday) rows as an inline SELECT ... UNION ALL (VALUES can't be aliased on SQLite)."""
+    selects = [
+        select(literal(d, Date).label("day"), literal(cal.is_holiday(d)).label("is_holiday"))
+        for d in days
+    ]
+    return (union_all(*selects) if len(selects) > 1 else selects[0]).subquery("days")
+
+
+def _insert_for_department(db, days_sub, department_id):
+    E = models.Employee
+    LR = models.LeaveRequest
+    Rec = models.AttendanceRecord.__table__
+    on_leave = exists().where(
+        LR.employee_id == E.id,
+        LR.status == models.LeaveStatus.approved,
+        LR.start_date <= days_sub.c.day,
+        LR.end_date >= days_sub.c.day,
+    )
+    status = case(
+        (days_sub.c.is_holiday, literal(HOLIDAY, String)),
+        (on_leave, literal(ON_LEAVE, String)),
+        else_=literal(ABSENT, String),
+    )
+    dept_filter = E.department_id.is_(None) if department_id is None else E.department_id == department_id
+    source = (
+        select(E.id, days_sub.c.day, status)
+        .select_from(E)
+        .join(days_sub, true())
+        # the WHERE clause also keeps SQLite's INSERT ... SELECT ... ON CONFLICT unambiguous
+        .where(
+            dept_filter,
+            E.is_active.isnot(False),
+            # nobody is absent before their record existed
+            E.created_at.is_(None) | (func.date(E.created_at) <= days_sub.c.day),
+        )
+    )
+    stmt = dialect_insert(db.get_bind())(Rec).from_select(["employee_id", "date", "status"], source)
+    stmt = stmt.on_conflict_do_nothing(index_elements=[Rec.c.employee_id, Rec.c.date])
+    return db.execute(stmt).rowcount
+
+
+def fill_absences(db, start: date, end: date) -> dict:
+    """
+    Fill missing rows for weekdays in [start, end], never later than yesterday
+    (today can still get a check-in) nor in archived months, whose rows are no
+    longer in the table to conflict with. Commits per department and month.
+    """
+    end = min(end, date.today() - timedelta(days=1))
+    archived_until = archive.cutoff()
+    if archived_until is not None:
+        start = max(start, archived_until)
+    days = list(working_days(start, end))
+    if not days:
+        return {"days": 0, "departments": 0, "inserted": 0}
+
+    cal = holiday_calendar.get_calendar(db)
+    department_ids = [row.id for row in db.query(models.Department.id).order_by(models.Department.id)]
+    by_month = {}
+    for d in days:
+        by_month.setdefault((d.year, d.month), []).append(d)
+
+    inserted = 0
+    for (year, month), month_days in sorted(by_month.items()):
+        days_sub = _days_table(month_days, cal)
+        for department_id in department_ids + [None]:
+            inserted += _insert_for_department(db, days_sub, department_id)
+            db.commit()
+        refresh_month(db, year, month)
+        db.commit()
+    return {"days": len(days), "departments": len(department_ids), "inserted": inserted}
@@ -0,0 +1,205 @@
+"""
+Cold storage for old attendance_records (needs pyarrow: pip install pyarrow).
+
+archive_older_than() moves whole months past the retention window out of the
+table into one zstd-compressed Parquet file per month under
+ARCHIVE_DIR/attendance_records/YYYY-MM.parquet. Each month is streamed from a
+server-side cursor into the file chunk by chunk, the file is moved into place
+atomically, and only then are the copied rows deleted. Re-running is safe: rows
+already in a month's file are skipped, rows that reached the table later (e.g.
+a late bulk punch) are appended to it.
+
+The archived months end at cutoff(). /attendance/list and /attendance/export
+read the files as well when start_date is before it (rows_between), and
+summaries.refresh_month() reads them for archived months, so the summary
+tables keep their history.
+"""
+import os
+from collections import deque, namedtuple
+from datetime import date
+
+from sqlalchemy import func, select
+
+from app import models
+from app.config import settings
+from app.partitions import add_months, month_range
+from app.summaries import as_naive_utc, month_bounds
+
+COLUMNS = ("id", "employee_id", "date", "check_in_time", "check_out_time", "status")
+# same fields, in the same order, as schemas.AttendanceOut and the export columns
+ArchivedRow = namedtuple("ArchivedRow", COLUMNS)
+
+# rows per Parquet row group / per fetch from the table
+_CHUNK = 50_000
+_TABLE = models.AttendanceRecord.__tablename__
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise RuntimeError("attendance archiving needs the pyarrow package (pip install pyarrow)")
+    return pyarrow, pyarrow.parquet
+
+
+def _schema(pa):
+    return pa.schema([
+        ("id", pa.int64()),
+        ("employee_id", pa.int64()),
+        ("date", pa.date32()),
+        # naive UTC, like the values the app writes
+        ("check_in_time", pa.timestamp("us")),
+        ("check_out_time", pa.timestamp("us")),
+        ("status", pa.string()),
+    ])
+
+
+def _dir(base: str = None) -> str:
+    return os.path.join(base or settings.ARCHIVE_DIR, _TABLE)
+
+
+def month_path(year: int, month: int, base: str = None) -> str:
+    return os.path.join(_dir(base), f"{year:04d}-{month:02d}.parquet")
+
+
+def archived_months(base: str = None) -> list:
+    """Sorted (year, month) of every archive file."""
+    try:
+        names = os.listdir(_dir(base))
+    except FileNotFoundError:
+        return []
+    found = []
+    for name in names:
+        stem, ext = os.path.splitext(name)
+        if ext == ".parquet" and len(stem) == 7 and stem[4] == "-":
+            found.append((int(stem[:4]), int(stem[5:])))
+    return sorted(found)
+
+
+def cutoff(base: str = None):
+    """First day after the last archived month, or None if nothing is archived."""
+    months = archived_months(base)
+    if not months:
+        return None
+    year, month = add_months(*months[-1], 1)
+    return date(year, month, 1)
+
+
+def _columns(rows):
+    data = {name: [] for name in COLUMNS}
+    for row in rows:
+        for name, value in zip(COLUMNS, row):
+            data[name].append(as_naive_utc(value) if name.endswith("_time") else value)
+    return data
+
+
+def archive_month(db, year: int, month: int, base: str = None) -> int:
+    """
+    Move one month of attendance_records into its archive file; returns the
+    number of rows moved. Commits the delete.
+    """
+    pa, pq = _pyarrow()
+    schema = _schema(pa)
+    path = month_path(year, month, base)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    start, end = month_bounds(year, month)
+    Rec = models.AttendanceRecord
+
+    archived_ids = set()
+    if os.path.exists(path):
+        archived_ids = set(pq.read_table(path, columns=["id"]).column("id").to_pylist())
+
+    # (employee_id, date) order is served by _emp_date_uc and lets readers skip row groups by employee
+    stmt = (
+        select(*(getattr(Rec, c) for c in COLUMNS))
+        .where(Rec.date >= start, Rec.date <= end)
+        .order_by(Rec.employee_id, Rec.date)
+        .execution_options(yield_per=_CHUNK)
+    )
+    tmp = path + ".tmp"
+    moved, max_id = 0, None
+    with pq.ParquetWriter(tmp, schema, compression=settings.ARCHIVE_COMPRESSION) as writer:
+        if archived_ids:
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=_CHUNK):
+                writer.write_batch(batch)
+        result = db.connection().execution_options(stream_results=True).execute(stmt)
+        for rows in result.partitions():
+            rows = [row for row in rows if row.id not in archived_ids]
+            if not rows:
+                continue
+            writer.write_table(pa.Table.from_pydict(_columns(rows), schema=schema))
+            moved += len(rows)
+            max_id = max(max_id or 0, max(row.id for row in rows))
+    if not moved:
+        os.remove(tmp)
+    else:
+        os.replace(tmp, path)
+
+    # rows inserted for this month while it was being copied have higher ids and stay for the next run;
+    # rows the file already held (a crash after the replace last time) are dropped as well
+    top = max(max_id or 0, max(archived_ids, default=0))
+    if top:
+        db.query(Rec).filter(Rec.date >= start, Rec.date <= end, Rec.id <= top).delete(synchronize_session=False)
+    db.commit()
+    return moved
+
+
+def archive_older_than(db, months: int, today: date = None, base: str = None) -> dict:
+    """Archive every month that ended more than `months` full months before today's month."""
+    today = today or date.today()
+    oldest = db.query(func.min(models.AttendanceRecord.date)).scalar()
+    year, month = add_months(today.year, today.month, -months)
+    last = date(*add_months(year, month, -1), 1)
+    if oldest is None or oldest > last:
+        return {"months": 0, "rows": 0}
+    done, rows = 0, 0
+    for y, m in month_range(oldest, last):
+        rows += archive_month(db, y, m, base)
+        done += 1
+    return {"months": done, "rows": rows}
+
+
+def _read(path, columns, filters):
+    _, pq = _pyarrow()
+    # memory-mapped: only the column chunks of row groups that pass the filters are read
+    return pq.read_table(path, columns=list(columns), filters=filters or None, memory_map=True)
+
+
+def rows_between(start: date, end: date = None, employee_id: int = None, base: str = None) -> list:
+    """Archived rows with start <= date <= end (and for one employee) as ArchivedRow."""
+    found = []
+    for year, month in archived_months(base):
+        first, last = month_bounds(year, month)
+        if last < start or (end is not None and first > end):
+            continue
+        filters = [("date", ">=", start)]
+        if end is not None:
+            filters.append(("date", "<=", end))
+        if employee_id is not None:
+            filters.append(("employee_id", "=", employee_id))
+        table = _read(month_path(year, month, base), COLUMNS, filters)
+        found.extend(ArchivedRow(*values) for values in zip(*(table.column(c).to_pylist() for c in COLUMNS)))
+    return found
+
+
+def month_rows(year: int, month: int, base: str = None) -> list:
+    """Every archived row of one month (for summary rebuilds); [] when the month isn't archived."""
+    path = month_path(year, month, base)
+    if not os.path.exists(path):
+        return []
+    table = _read(path, COLUMNS, None)
+    return [ArchivedRow(*values) for values in zip(*(table.column(c).to_pylist() for c in COLUMNS))]
+
+
+def interleave(rows, pending: deque, precedes):
+    """
+    One sorted chunk of table rows with the archived rows (pending, same order)
+    that come before each of them; consumed rows are popped from pending.
+    """
+    out = []
+    for row in rows:
+        while pending and precedes(pending[0], row):
+            out.append(pending.popleft())
+        out.append(row)
+    return out
@@ -0,0 +1,126 @@
+"""
+Async versions of the data routers (enabled with settings.ASYNC_DB).
+
+asyncify_router() re-mounts every handler of a router as an `async def`
+endpoint on the AsyncEngine: the handler body runs through
+AsyncSession.run_sync(), so its queries go through asyncpg / aiosqlite on the
+event loop instead of holding a threadpool thread while waiting on the DB.
+The handlers themselves are shared with the sync routers; the response is
+serialized inside run_sync so lazy loads still work. Handlers that are already
+`async def` (e.g. create_employee) only get their dependencies swapped and
+reach the session through app.database.run_db.
+"""
+import inspect
+
+from fastapi import APIRouter, Depends
+from fastapi.encoders import jsonable_encoder
+from fastapi.params import Depends as DependsParam
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from pydantic import ValidationError
+from starlette.responses import Response
+
+from app.database import get_async_db, get_db
+from app.deps import get_current_user, get_current_user_async
+
+# sync dependency -> async replacement
+_SWAPS = {get_db: get_async_db, get_current_user: get_current_user_async}
+
+
+def _serialize(route: APIRoute, result, sub_responses):
+    if isinstance(result, Response):
+        return result
+    if route.response_field is not None:
+        result, errors = route.response_field.validate(result, {}, loc=("response",))
+        if errors:
+            raise ValidationError(errors, route.response_field.type_)
+    response = JSONResponse(
+        jsonable_encoder(
+            result,
+            include=route.response_model_include,
+            exclude=route.response_model_exclude,
+            by_alias=route.response_model_by_alias,
+            exclude_unset=route.response_model_exclude_unset,
+            exclude_defaults=route.response_model_exclude_defaults,
+            exclude_none=route.response_model_exclude_none,
+        ),
+        status_code=route.status_code or 200,
+    )
+    # headers / status set by the handler on an injected `response: Response`
+    for sub in sub_responses:
+        response.headers.update(sub.headers)
+        if sub.status_code:
+            response.status_code = sub.status_code
+    return response
+
+
+def _async_endpoint(route: APIRoute):
+    endpoint = route.endpoint
+    signature = inspect.signature(endpoint)
+    db_param = None
+    params = []
+    for param in signature.parameters.values():
+        dep = param.default
+        if isinstance(dep, DependsParam) and dep.dependency in _SWAPS:
+            if dep.dependency is get_db:
+                db_param = param.name
+            param = param.replace(
+                default=Depends(_SWAPS[dep.dependency], use_cache=dep.use_cache),
+                annotation=inspect.Parameter.empty,
+            )
+        params.append(param)
+    if db_param is None:
+        return endpoint
+
+    if inspect.iscoroutinefunction(endpoint):
+        async def run(**kwargs):
+            return await endpoint(**kwargs)
+    else:
+        run = _run_sync_endpoint(route, endpoint, db_param)
+
+    run.__signature__ = signature.replace(parameters=params)
+    run.__name__ = endpoint.__name__
+    run.__doc__ = endpoint.__doc__
+    return run
+
+
+def _run_sync_endpoint(route: APIRoute, endpoint, db_param: str):
+    async def run(**kwargs):
+        db = kwargs[db_param]
+        sub_responses = [v for v in kwargs.values() if isinstance(v, Response)]
+
+        def call(session):
+            result = endpoint(**{**kwargs, db_param: session})
+            return _serialize(route, result, sub_responses)
+
+        return await db.run_sync(call)
+
+    return run
+
+
+def asyncify_router(router: APIRouter) -> APIRouter:
+    """Copy of router whose DB-backed handlers run on the async engine."""
+    async_router = APIRouter()
+    for route in router.routes:
+        if not isinstance(route, APIRoute):
+            async_router.routes.append(route)
+            continue
+        async_router.add_api_route(
+            route.path,
+            _async_endpoint(route),
+            methods=list(route.methods),
+            response_model=route.response_model,
+            status_code=route.status_code,
+            tags=route.tags,
+            dependencies=route.dependencies,
+            summary=route.summary,
+            description=route.description,
+            response_description=route.response_description,
+            responses=route.responses,
+            deprecated=route.deprecated,
+            operation_id=route.operation_id,
+            include_in_schema=route.include_in_schema,
+            response_class=route.response_class,
+            name=route.name,
+        )
+    return async_router
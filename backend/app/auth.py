@@ -1,6 +1,11 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from passlib.context import CryptContext
 from jose import jwt, JWTError
+from app.cache import TTLCache
 from app.config import settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -11,6 +16,61 @@ def hash_password(password: str) -> str:
 def verify_password(plain: str, hashed: str) -> bool:
     return pwd_context.verify(plain, hashed)
 
+# bcrypt releases the GIL, so a small thread pool runs hashes in parallel while
+# keeping their CPU cost off the request threadpool
+_password_pool = None
+_pool_lock = threading.Lock()
+_pool_stats = {"queued": 0, "running": 0, "completed": 0, "rejected": 0, "wait_seconds_total": 0.0}
+
+class PasswordPoolBusy(Exception):
+    """Raised when the password pool queue is full."""
+
+def _submit(fn, *args):
+    with _pool_lock:
+        if _pool_stats["queued"] >= settings.PASSWORD_HASH_MAX_QUEUE:
+            _pool_stats["rejected"] += 1
+            raise PasswordPoolBusy()
+        _pool_stats["queued"] += 1
+    submitted = time.perf_counter()
+
+    def run():
+        with _pool_lock:
+            _pool_stats["queued"] -= 1
+            _pool_stats["running"] += 1
+            _pool_stats["wait_seconds_total"] += time.perf_counter() - submitted
+        try:
+            return fn(*args)
+        finally:
+            with _pool_lock:
+                _pool_stats["running"] -= 1
+                _pool_stats["completed"] += 1
+
+    global _password_pool
+    with _pool_lock:
+        if _password_pool is None:
+            _password_pool = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+        return _password_pool.submit(run)
+
+async def hash_password_async(password: str) -> str:
+    return await asyncio.wrap_future(_submit(hash_password, password))
+
+async def verify_password_async(plain: str, hashed: str) -> bool:
+    return await asyncio.wrap_future(_submit(verify_password, plain, hashed))
+
+def password_pool_stats() -> dict:
+    with _pool_lock:
+        stats = dict(_pool_stats)
+    stats["workers"] = settings.PASSWORD_HASH_WORKERS
+    stats["max_queue"] = settings.PASSWORD_HASH_MAX_QUEUE
+    return stats
+
+def shutdown_password_pool():
+    global _password_pool
+    with _pool_lock:
+        pool, _password_pool = _password_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
     to_encode = data.copy()
     if expires_delta:
@@ -21,9 +81,19 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None):
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
+# token -> decoded payload, so repeat requests with the same token skip jwt.decode
+_token_cache = TTLCache(settings.TOKEN_CACHE_SIZE, settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
 def decode_token(token: str):
+    payload = _token_cache.get(token)
+    if payload is not None:
+        return payload
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
     except JWTError:
         return None
+    # never serve a cached payload past the token's own expiry
+    exp = payload.get("exp")
+    ttl = exp - time.time() if isinstance(exp, (int, float)) else None
+    _token_cache.set(token, payload, ttl)
+    return payload
@@ -1,11 +1,73 @@
+from datetime import time
+from typing import Optional
 from pydantic import BaseSettings
 
 class Settings(BaseSettings):
     DATABASE_URL: str
     SECRET_KEY: str
+    # serve the data routers through an AsyncEngine (asyncpg / aiosqlite) instead of the threadpool
+    ASYNC_DB: bool = False
+    # defaults to DATABASE_URL with its driver swapped for the async one
+    ASYNC_DATABASE_URL: Optional[str] = None
+
+    # connection pool, per engine and per worker process (sizing is ignored for SQLite)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = -1  # seconds, -1 disables
+    DB_POOL_PRE_PING: bool = True  # one extra round-trip per checkout; off if the network/DB never drops idle connections
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440  # 24 hours
 
+    # authenticated principal / decoded token caches (0 size disables)
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    TOKEN_CACHE_SIZE: int = 10000
+
+    # dedicated bcrypt worker pool (login / employee creation)
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 1000
+
+    # max events accepted by POST /attendance/bulk
+    BULK_PUNCH_MAX_EVENTS: int = 5000
+    # max rows accepted by POST /employees/import (the import_employees.py CLI has no limit)
+    EMPLOYEE_IMPORT_MAX_ROWS: int = 50000
+
+    # in-process holiday calendar; create_holiday clears it locally, other workers pick changes up after this
+    HOLIDAY_CACHE_TTL_SECONDS: int = 300
+
+    # check-ins after this time of day count as late (same clock as stored check-in times, i.e. UTC)
+    LATE_CHECK_IN_AFTER: time = time(9, 30)
+
+    # GET /reports/department results are reused for this long per department and period
+    DASHBOARD_CACHE_SECONDS: int = 5
+
+    # per-request latency / SQL count histograms, Server-Timing header and GET /metrics (Prometheus text)
+    REQUEST_METRICS: bool = False
+    # lets a scraper read GET /metrics with "Authorization: Bearer <token>"; otherwise an admin JWT is required
+    METRICS_SCRAPE_TOKEN: Optional[str] = None
+
+    # slow-query log: statements over SLOW_QUERY_MS (0 disables) go to a rotating JSON-lines file with their EXPLAIN plan
+    SLOW_QUERY_MS: float = 0
+    SLOW_QUERY_EXPLAIN: bool = True
+    SLOW_QUERY_LOG_PATH: str = "slow_queries.log"
+    SLOW_QUERY_LOG_MAX_BYTES: int = 10 * 1024 * 1024
+    SLOW_QUERY_LOG_BACKUPS: int = 5
+
+    # response cache for the list/detail GETs: "" (off), "memory" (per worker) or "redis" (shared, needs REDIS_URL)
+    RESPONSE_CACHE_BACKEND: str = ""
+    RESPONSE_CACHE_TTL_SECONDS: int = 30
+    RESPONSE_CACHE_SIZE: int = 5000
+    REDIS_URL: str = "redis://localhost:6379/0"
+
+    # /attendance/list and /employees/list: select plain columns and serialize with orjson (same JSON)
+    FAST_LIST_RESPONSES: bool = True
+
+    # cold storage (archive_attendance.py, needs pyarrow): months older than ARCHIVE_AFTER_MONTHS move to Parquet files
+    ARCHIVE_DIR: str = "archive"
+    ARCHIVE_AFTER_MONTHS: int = 24
+    ARCHIVE_COMPRESSION: str = "zstd"
+
     class Config:
         env_file = ".env"
 
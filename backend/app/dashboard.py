@@ -0,0 +1,132 @@
+"""
+Department dashboard: who is in today / this week.
+
+department_summary() answers with one grouped query over the department's
+active employees x the period's days, left-joined to attendance_records and
+holidays, with an EXISTS on approved leave_requests. Each member-day counts as
+present (checked in; late if after LATE_CHECK_IN_AFTER), or, on a working day
+without a check-in, on_leave or absent. Weekends and holidays are not working
+days. Results are kept for DASHBOARD_CACHE_SECONDS per (department, period, day).
+"""
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import Date, and_, case, exists, func, literal, not_, or_, select, true, union_all
+
+from app import models
+from app.cache import TTLCache
+from app.config import settings
+
+TODAY = "today"
+WEEK = "week"
+PERIODS = (TODAY, WEEK)
+
+_cache = TTLCache(maxsize=256, ttl=settings.DASHBOARD_CACHE_SECONDS)
+
+
+def period_bounds(period: str, today: date):
+    """[start, end] of the period; a week runs Monday through today."""
+    if period == WEEK:
+        return today - timedelta(days=today.weekday()), today
+    return today, today
+
+
+def _days_table(start: date, end: date, aware: bool):
+    """(day, weekend, late_after) per day; late_after is the day's late check-in threshold."""
+    Rec = models.AttendanceRecord
+    selects = []
+    day = start
+    while day <= end:
+        late_after = datetime.combine(day, settings.LATE_CHECK_IN_AFTER)
+        if aware:  # timestamptz on PostgreSQL; stored values are UTC
+            late_after = late_after.replace(tzinfo=timezone.utc)
+        selects.append(select(
+            literal(day, Date).label("day"),
+            literal(day.weekday() >= 5).label("weekend"),
+            literal(late_after, Rec.check_in_time.type).label("late_after"),
+        ))
+        day += timedelta(days=1)
+    return (union_all(*selects) if len(selects) > 1 else selects[0]).subquery("days")
+
+
+def _count(condition):
+    return func.sum(case((condition, 1), else_=0))
+
+
+def department_summary(db, department_id: int, period: str, today: date = None) -> dict:
+    today = today or date.today()
+    key = (department_id, period, today)
+    cached = _cache.get(key)
+    if cached is not None:
+        return cached
+
+    start, end = period_bounds(period, today)
+    E = models.Employee
+    Rec = models.AttendanceRecord
+    LR = models.LeaveRequest
+    days = _days_table(start, end, db.get_bind().dialect.name == "postgresql")
+    holidays = (
+        select(models.Holiday.date.label("day"))
+        .where(models.Holiday.date >= start, models.Holiday.date <= end)
+        .distinct()
+        .subquery("holiday_days")
+    )
+
+    checked_in = Rec.check_in_time.isnot(None)
+    late = and_(checked_in, Rec.check_in_time > days.c.late_after)
+    is_holiday = holidays.c.day.isnot(None)
+    # a working day for this member: not a weekend or holiday, and not before they joined
+    working = and_(
+        not_(days.c.weekend), not_(is_holiday),
+        or_(E.created_at.is_(None), func.date(E.created_at) <= days.c.day),
+    )
+    on_leave = exists().where(
+        LR.employee_id == E.id,
+        LR.status == models.LeaveStatus.approved,
+        LR.start_date <= days.c.day,
+        LR.end_date >= days.c.day,
+    )
+    status = case(
+        (late, "late"),
+        (checked_in, "present"),
+        (is_holiday, "holiday"),
+        (days.c.weekend, "off"),
+        (on_leave, "on_leave"),
+        else_="absent",
+    )
+    stmt = (
+        select(
+            E.id, E.first_name, E.last_name,
+            _count(checked_in).label("present_days"),
+            _count(late).label("late_days"),
+            _count(and_(not_(checked_in), working, on_leave)).label("on_leave_days"),
+            _count(and_(not_(checked_in), working, not_(on_leave))).label("absent_days"),
+            # one row per member for today, so MAX just picks it
+            func.max(case((days.c.day == today, status))).label("status"),
+        )
+        .select_from(E)
+        .join(days, true())
+        .outerjoin(holidays, holidays.c.day == days.c.day)
+        .outerjoin(Rec, and_(Rec.employee_id == E.id, Rec.date == days.c.day))
+        .where(E.department_id == department_id, E.is_active.isnot(False))
+        .group_by(E.id, E.first_name, E.last_name)
+        .order_by(E.first_name, E.last_name, E.id)
+    )
+    members = [dict(row._mapping) for row in db.execute(stmt)]
+    result = {
+        "department_id": department_id,
+        "period": period,
+        "start_date": start,
+        "end_date": end,
+        "members_total": len(members),
+        "present": sum(m["present_days"] for m in members),
+        "late": sum(m["late_days"] for m in members),
+        "on_leave": sum(m["on_leave_days"] for m in members),
+        "absent": sum(m["absent_days"] for m in members),
+        "members": members,
+    }
+    _cache.set(key, result)
+    return result
+
+
+def invalidate():
+    _cache.clear()
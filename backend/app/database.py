@@ -1,14 +1,95 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from starlette.concurrency import run_in_threadpool
 from app.config import settings
+from app.pool_metrics import PoolMetrics, instrument_engine, instrumented_pool
+from app import slow_queries
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+def _engine_options(url: str, pool_class, metrics: PoolMetrics) -> dict:
+    options = {"pool_pre_ping": settings.DB_POOL_PRE_PING, "pool_recycle": settings.DB_POOL_RECYCLE}
+    url = make_url(url)
+    if url.get_driver_name() == "pysqlite":
+        # sessions are opened and closed on different threadpool threads
+        options["connect_args"] = {"check_same_thread": False}
+    # SQLite picks its own single-file pools; sizing only applies to server databases
+    if url.get_backend_name() != "sqlite":
+        options.update(
+            poolclass=instrumented_pool(pool_class, metrics),
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+        )
+    return options
+
+pool_metrics = {"sync": PoolMetrics()}
+
+engine = create_engine(settings.DATABASE_URL, **_engine_options(settings.DATABASE_URL, QueuePool, pool_metrics["sync"]))
+instrument_engine(engine, pool_metrics["sync"])
+slow_queries.install(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+def dialect_insert(bind):
+    """
+    Dialect-specific INSERT construct supporting ON CONFLICT (upsert).
+    Only PostgreSQL and SQLite are supported.
+    """
+    name = bind.dialect.name
+    if name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"upsert is not supported on {name}")
+    return insert
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+# --- async stack (opt-in, see settings.ASYNC_DB) ---
+
+_ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+_async_engine = None
+_AsyncSessionLocal = None
+
+def async_database_url():
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    url = make_url(settings.DATABASE_URL)
+    backend = url.get_backend_name()
+    if backend not in _ASYNC_DRIVERS:
+        raise NotImplementedError(f"no async driver configured for {backend}")
+    return str(url.set(drivername=f"{backend}+{_ASYNC_DRIVERS[backend]}"))
+
+def get_async_engine():
+    """AsyncEngine for DATABASE_URL, created on first use."""
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+        url = async_database_url()
+        pool_metrics["async"] = PoolMetrics()
+        _async_engine = create_async_engine(url, **_engine_options(url, AsyncAdaptedQueuePool, pool_metrics["async"]))
+        instrument_engine(_async_engine.sync_engine, pool_metrics["async"])
+        slow_queries.install(_async_engine.sync_engine)
+        _AsyncSessionLocal = sessionmaker(_async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+    return _async_engine
+
+async def get_async_db():
+    get_async_engine()
+    async with _AsyncSessionLocal() as db:
+        yield db
+
+async def run_db(db, fn, *args):
+    """
+    Call fn(session, *args) from an async handler without blocking the event loop:
+    through run_sync on an AsyncSession, in the threadpool on a sync Session.
+    """
+    if hasattr(db, "run_sync"):
+        return await db.run_sync(fn, *args)
+    return await run_in_threadpool(fn, db, *args)
@@ -1,24 +1,107 @@
+from dataclasses import dataclass
+from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError
-from sqlalchemy.orm import Session
-from app.database import get_db
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from app.database import get_async_db, get_db
 from app import models
 from app.auth import decode_token
+from app.cache import TTLCache
+from app.config import settings
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+
+@dataclass(frozen=True)
+class Principal:
+    """Authenticated caller, detached from any DB session so it can be cached."""
+    id: int
+    role: models.RoleEnum
+    email: Optional[str] = None
+    department_id: Optional[int] = None
+    is_active: bool = True
+
+    @classmethod
+    def from_employee(cls, emp: models.Employee):
+        return cls(id=emp.id, role=emp.role, email=emp.email, department_id=emp.department_id, is_active=emp.is_active)
+
+
+# user_id -> Principal
+_principal_cache = TTLCache(settings.PRINCIPAL_CACHE_SIZE, settings.PRINCIPAL_CACHE_TTL_SECONDS)
+
+def invalidate_principal(user_id: int):
+    _principal_cache.invalidate(user_id)
+
+@event.listens_for(models.Employee, "after_update")
+@event.listens_for(models.Employee, "after_delete")
+def _employee_changed(mapper, connection, target):
+    # role / is_active / department changes must not be served from the cache.
+    # Dropped at flush and again after commit: a request in between still reads
+    # the old committed row and may re-cache it.
+    invalidate_principal(target.id)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("changed_employee_ids", set()).add(target.id)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session):
+    for user_id in session.info.pop("changed_employee_ids", ()):
+        invalidate_principal(user_id)
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back(session):
+    session.info.pop("changed_employee_ids", None)
+
+
+def _token_payload(token: str):
     payload = decode_token(token)
     if not payload:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
     user_id = payload.get("user_id")
     if user_id is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    return user_id, payload
+
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    user_id, _ = _token_payload(token)
+    principal = _principal_cache.get(user_id)
+    if principal is not None:
+        return principal
     user = db.query(models.Employee).filter(models.Employee.id == user_id).first()
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-    return user
+    principal = Principal.from_employee(user)
+    _principal_cache.set(user_id, principal)
+    return principal
+
+async def get_current_user_async(token: str = Depends(oauth2_scheme), db = Depends(get_async_db)):
+    """get_current_user for handlers running on the async engine."""
+    user_id, _ = _token_payload(token)
+    principal = _principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+    user = await db.get(models.Employee, user_id)
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    principal = Principal.from_employee(user)
+    _principal_cache.set(user_id, principal)
+    return principal
+
+def get_token_principal(token: str = Depends(oauth2_scheme)):
+    """
+    Principal built from the JWT claims alone (user_id, role), without touching the DB.
+    For hot paths that only need the caller's id/role, e.g. attendance check-in.
+    The employee is not checked to exist: callers that write rows referencing it
+    must turn a foreign key failure into a 401 (see attendance._run_punch).
+    """
+    user_id, payload = _token_payload(token)
+    try:
+        role = models.RoleEnum(payload.get("role"))
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    return Principal(id=user_id, role=role)
 
 def require_role(role: str):
     def role_checker(user=Depends(get_current_user)):
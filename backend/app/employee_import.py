@@ -0,0 +1,198 @@
+"""
+Bulk employee import (POST /employees/import, import_employees.py).
+
+Rows come from CSV (header row with EmployeeCreate's field names) or NDJSON
+(one object per line) and are validated with schemas.EmployeeCreate. Emails
+that repeat within the file, are already registered (one IN query per
+_CHUNK emails) or point at an unknown department are reported per row.
+Passwords of the remaining rows are hashed on the bcrypt pool, at most a few
+per worker queued at a time so logins still get through, and the rows are
+inserted with multi-row INSERTs in one transaction. Nothing is written when
+dry_run is set or when no row is valid.
+"""
+import asyncio
+import csv
+import io
+import json
+
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+from app import models, response_cache, schemas
+from app.auth import hash_password_async
+from app.config import settings
+from app.database import run_db
+from app.deps import invalidate_principal
+
+FORMATS = ("csv", "ndjson")
+FIELDS = tuple(schemas.EmployeeCreate.__fields__)
+# rows per INSERT / emails per IN list
+_CHUNK = 1000
+
+
+class ImportRow:
+    __slots__ = ("line", "email", "payload", "password_hash", "id", "error")
+
+    def __init__(self, line: int, email=None, payload=None, error=None):
+        self.line = line
+        self.email = email
+        self.payload = payload
+        self.password_hash = None
+        self.id = None
+        self.error = error
+
+    def result(self) -> dict:
+        if self.error:
+            status = "failed"
+        else:
+            status = "created" if self.id is not None else "valid"
+        return {"line": self.line, "email": self.email, "status": status, "id": self.id, "detail": self.error}
+
+
+def format_for(filename: str = None, content_type: str = None):
+    """Guess the format from a file name or content type; None if neither says."""
+    name = (filename or "").lower()
+    if name.endswith(".csv") or (content_type or "").startswith("text/csv"):
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl")) or (content_type or "") in ("application/x-ndjson", "application/jsonl"):
+        return "ndjson"
+    return None
+
+
+def _raw_rows(text: str, fmt: str):
+    """(line number, dict or None, error) for every data row."""
+    if fmt == "csv":
+        reader = csv.DictReader(io.StringIO(text))
+        unknown = set(reader.fieldnames or ()) - set(FIELDS)
+        if unknown:
+            raise ValueError(f"unknown CSV columns: {', '.join(sorted(unknown))}")
+        for raw in reader:
+            # empty cells are missing values, not empty strings
+            yield reader.line_num, {k: v for k, v in raw.items() if k is not None and v not in ("", None)}, None
+        return
+    for line, chunk in enumerate(text.splitlines(), start=1):
+        if not chunk.strip():
+            continue
+        try:
+            raw = json.loads(chunk)
+        except ValueError as e:
+            yield line, None, f"invalid JSON: {e}"
+            continue
+        if not isinstance(raw, dict):
+            yield line, None, "expected a JSON object"
+            continue
+        yield line, raw, None
+
+
+def _describe(exc: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in exc.errors())
+
+
+def parse(text: str, fmt: str) -> list:
+    """Validate every row; raises ValueError for an unusable file (bad format, unknown columns)."""
+    if fmt not in FORMATS:
+        raise ValueError(f"format must be one of {list(FORMATS)}")
+    rows = []
+    for line, raw, error in _raw_rows(text, fmt):
+        if error:
+            rows.append(ImportRow(line, error=error))
+            continue
+        email = raw.get("email")
+        try:
+            payload = schemas.EmployeeCreate(**raw)
+            rows.append(ImportRow(line, payload.email, payload))
+        except ValidationError as e:
+            rows.append(ImportRow(line, email, error=_describe(e)))
+    return rows
+
+
+def check_conflicts(db, rows: list):
+    """Flag repeated emails, registered emails and unknown departments on the rows."""
+    first_line = {}
+    for row in rows:
+        if row.error:
+            continue
+        email = row.payload.email
+        if email in first_line:
+            row.error = f"email repeats line {first_line[email]}"
+        else:
+            first_line[email] = row.line
+
+    emails = list(first_line)
+    taken = set()
+    for i in range(0, len(emails), _CHUNK):
+        chunk = emails[i:i + _CHUNK]
+        taken.update(db.execute(select(models.Employee.email).where(models.Employee.email.in_(chunk))).scalars())
+    departments = set(db.execute(select(models.Department.id)).scalars())
+    for row in rows:
+        if row.error:
+            continue
+        if row.payload.email in taken:
+            row.error = "Email already registered"
+        elif row.payload.department_id is not None and row.payload.department_id not in departments:
+            row.error = f"unknown department_id {row.payload.department_id}"
+
+
+async def hash_passwords(rows: list):
+    """Hash the valid rows' passwords on the bcrypt pool, a bounded window at a time."""
+    pending = [row for row in rows if not row.error]
+    window = max(1, settings.PASSWORD_HASH_WORKERS * 2)
+    for i in range(0, len(pending), window):
+        batch = pending[i:i + window]
+        hashes = await asyncio.gather(*(hash_password_async(row.payload.password) for row in batch))
+        for row, hashed in zip(batch, hashes):
+            row.password_hash = hashed
+
+
+def insert(db, rows: list):
+    """Insert the valid rows, read their ids back and commit."""
+    valid = [row for row in rows if not row.error]
+    E = models.Employee
+    for i in range(0, len(valid), _CHUNK):
+        chunk = valid[i:i + _CHUNK]
+        values = []
+        for row in chunk:
+            p = row.payload
+            values.append({
+                "first_name": p.first_name, "last_name": p.last_name, "email": p.email,
+                "password_hash": row.password_hash, "phone": p.phone, "designation": p.designation,
+                "department_id": p.department_id, "role": models.RoleEnum(p.role.value),
+            })
+        try:
+            db.execute(E.__table__.insert(), values)
+        except IntegrityError:
+            db.rollback()
+            for row in valid:
+                row.id = None
+            raise
+        ids = dict(db.execute(select(E.email, E.id).where(E.email.in_([row.email for row in chunk]))).all())
+        for row in chunk:
+            row.id = ids[row.email]
+    db.commit()
+
+
+async def import_employees(db, text: str, fmt: str, dry_run: bool = False, max_rows: int = None) -> dict:
+    """
+    Validate, check and (unless dry_run) insert every row; returns the per-row
+    report. Raises ValueError for an unusable file or more than max_rows rows,
+    IntegrityError if an email was registered concurrently (nothing is written).
+    """
+    rows = parse(text, fmt)
+    if max_rows is not None and len(rows) > max_rows:
+        raise ValueError(f"At most {max_rows} rows per import")
+    await run_db(db, check_conflicts, rows)
+    valid = sum(1 for row in rows if not row.error)
+    if valid and not dry_run:
+        await hash_passwords(rows)
+        await run_db(db, insert, rows)
+        for row in rows:
+            if row.id is not None:
+                invalidate_principal(row.id)
+        # leave lists embed employee names
+        response_cache.invalidate(response_cache.EMPLOYEES, response_cache.LEAVES)
+    return {
+        "created": 0 if dry_run else valid,
+        "failed": len(rows) - valid,
+        "results": [row.result() for row in rows],
+    }
@@ -0,0 +1,22 @@
+"""
+Fast path for large list responses (settings.FAST_LIST_RESPONSES).
+
+Instead of loading ORM objects, validating each one through an orm_mode schema
+and walking the result again with jsonable_encoder, the list endpoints select
+just the schema's columns and hand plain dicts to orjson. The field list comes
+from the response schema itself, so the wire format stays the same; see
+test_fast_json for the parity check.
+"""
+from fastapi.responses import ORJSONResponse
+
+
+def schema_columns(schema, model):
+    """Model columns for the schema's fields, in the schema's (= the JSON) order."""
+    return [getattr(model, name) for name in schema.__fields__]
+
+
+def fast_list_response(list_schema, item_schema, rows, **fields) -> ORJSONResponse:
+    """list_schema-shaped body: `items` built from the selected rows, other fields as given."""
+    names = list(item_schema.__fields__)
+    fields["items"] = [dict(zip(names, row)) for row in rows]
+    return ORJSONResponse({name: fields.get(name) for name in list_schema.__fields__})
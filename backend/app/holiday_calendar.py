@@ -0,0 +1,96 @@
+"""
+In-process holiday calendar.
+
+The holidays table is small and read far more often than written, so it is
+loaded with one query into a HolidayCalendar snapshot: a day-of-year bitset per
+year for O(1) is_holiday() and a sorted list of weekday holidays for
+working_days() (closed-form weekday count minus a bisect). The snapshot is
+dropped by invalidate() when a holiday is created in this process and expires
+after HOLIDAY_CACHE_TTL_SECONDS, which bounds staleness across workers. With a
+shared response cache backend it is also rebuilt as soon as the "holidays"
+generation moves, i.e. right after a create_holiday in any worker.
+"""
+import hashlib
+import json
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timezone
+
+from fastapi.encoders import jsonable_encoder
+
+from app import models, response_cache
+from app.cache import TTLCache
+from app.config import settings
+
+# Monday=0 ... Friday=4 are working days
+_WORKDAYS_PER_WEEK = 5
+
+_cache = TTLCache(maxsize=1, ttl=settings.HOLIDAY_CACHE_TTL_SECONDS)
+_KEY = "calendar"
+# kept across reloads so Last-Modified only moves when the content does
+_last = {"etag": None, "last_modified": None}
+
+
+def _weekdays_before(ordinal: int) -> int:
+    """Mon-Fri days with ordinal in [1, ordinal); ordinal 1 (0001-01-01) is a Monday."""
+    weeks, rem = divmod(ordinal - 1, 7)
+    return weeks * _WORKDAYS_PER_WEEK + min(rem, _WORKDAYS_PER_WEEK)
+
+
+def weekdays_between(start: date, end: date) -> int:
+    """Mon-Fri days in [start, end], inclusive."""
+    if end < start:
+        return 0
+    return _weekdays_before(end.toordinal() + 1) - _weekdays_before(start.toordinal())
+
+
+class HolidayCalendar:
+    def __init__(self, rows):
+        self.rows = sorted(rows, key=lambda r: (r["date"], r["id"]))
+        self._years = {}
+        weekday_holidays = set()
+        for r in self.rows:
+            d = r["date"]
+            self._years[d.year] = self._years.get(d.year, 0) | (1 << d.timetuple().tm_yday)
+            if d.weekday() < _WORKDAYS_PER_WEEK:
+                weekday_holidays.add(d.toordinal())
+        self._weekday_ordinals = sorted(weekday_holidays)
+        self.body = json.dumps(jsonable_encoder(self.rows), separators=(",", ":")).encode()
+        self.etag = '"%s"' % hashlib.sha1(self.body).hexdigest()
+
+    def is_holiday(self, d: date) -> bool:
+        return bool(self._years.get(d.year, 0) >> d.timetuple().tm_yday & 1)
+
+    def holidays_between(self, start: date, end: date) -> int:
+        """Holidays falling on a weekday in [start, end] (weekend holidays cost nothing)."""
+        if end < start:
+            return 0
+        return (bisect_right(self._weekday_ordinals, end.toordinal())
+                - bisect_left(self._weekday_ordinals, start.toordinal()))
+
+    def working_days(self, start: date, end: date) -> int:
+        """Mon-Fri days in [start, end], inclusive, that are not holidays."""
+        return weekdays_between(start, end) - self.holidays_between(start, end)
+
+
+def get_calendar(db) -> HolidayCalendar:
+    generation = response_cache.generation(response_cache.HOLIDAYS)
+    cal = _cache.get(_KEY)
+    if cal is not None and cal.generation == generation:
+        return cal
+    H = models.Holiday
+    rows = [
+        {"id": r.id, "name": r.name, "date": r.date, "description": r.description}
+        for r in db.query(H.id, H.name, H.date, H.description).order_by(H.date)
+    ]
+    cal = HolidayCalendar(rows)
+    if cal.etag != _last["etag"]:
+        _last["etag"] = cal.etag
+        _last["last_modified"] = datetime.now(timezone.utc).replace(microsecond=0)
+    cal.last_modified = _last["last_modified"]
+    cal.generation = generation
+    _cache.set(_KEY, cal)
+    return cal
+
+
+def invalidate():
+    _cache.clear()
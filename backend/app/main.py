@@ -1,6 +1,9 @@
 from fastapi import FastAPI
 from app.database import engine, Base
-from app.routers import auth, employees, attendance, holidays, leaves
+from app.routers import auth, employees, attendance, holidays, leaves, metrics, reports
+from app.auth import shutdown_password_pool
+from app import slow_queries
+from app.config import settings
 from fastapi.middleware.cors import CORSMiddleware
 
 app = FastAPI(title="Attendance + Phonebook API")
@@ -8,11 +11,20 @@ app = FastAPI(title="Attendance + Phonebook API")
 # create tables (for development only; prefer alembic migrations)
 #Base.metadata.create_all(bind=engine)
 
+data_routers = [employees.router, attendance.router, holidays.router, leaves.router, reports.router]
+if settings.ASYNC_DB:
+    from app.async_routes import asyncify_router
+    data_routers = [asyncify_router(r) for r in data_routers]
+
 app.include_router(auth.router)
-app.include_router(employees.router)
-app.include_router(attendance.router)
-app.include_router(holidays.router)
-app.include_router(leaves.router)
+for r in data_routers:
+    app.include_router(r)
+app.include_router(metrics.router)
+
+@app.on_event("shutdown")
+def shutdown():
+    shutdown_password_pool()
+    slow_queries.shutdown()
 
 
 
@@ -29,3 +41,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.REQUEST_METRICS:
+    from app.request_metrics import RequestMetricsMiddleware
+    # added last so it wraps CORS too and times the whole request
+    app.add_middleware(RequestMetricsMiddleware)
+elif settings.SLOW_QUERY_MS > 0:
+    from app.request_metrics import RequestScopeMiddleware
+    # the slow-query log still wants to know which route issued a statement
+    app.add_middleware(RequestScopeMiddleware)
+
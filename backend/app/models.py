@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, Boolean, Date, DateTime, ForeignKey, Enum, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Boolean, Date, DateTime, ForeignKey, Enum, Index, UniqueConstraint, DDL, event
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
+from datetime import datetime
 from .database import Base
 
 class RoleEnum(str, enum.Enum):
@@ -37,6 +38,48 @@ class Employee(Base):
 
     department = relationship("Department")
 
+    __table_args__ = (
+        # /employees/list?sort_by=... (email is covered by its unique index)
+        Index('ix_employees_first_name', 'first_name'),
+        Index('ix_employees_last_name', 'last_name'),
+        Index('ix_employees_designation', 'designation'),
+        Index('ix_employees_created_at', 'created_at'),
+    )
+
+# Directory search index over these columns (queried through app/search.py):
+# pg_trgm GIN expression index on PostgreSQL, FTS5 external-content table on SQLite.
+EMPLOYEE_SEARCH_COLUMNS = ("first_name", "last_name", "email", "phone", "designation")
+
+EMPLOYEE_SEARCH_DOCUMENT_SQL = "lower(" + " || ' ' || ".join(
+    f"coalesce({c}, '')" for c in EMPLOYEE_SEARCH_COLUMNS
+) + ")"
+
+_search_cols = ", ".join(EMPLOYEE_SEARCH_COLUMNS)
+_new_cols = ", ".join(f"new.{c}" for c in EMPLOYEE_SEARCH_COLUMNS)
+_old_cols = ", ".join(f"old.{c}" for c in EMPLOYEE_SEARCH_COLUMNS)
+
+EMPLOYEE_SEARCH_DDL = {
+    "postgresql": [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        f"CREATE INDEX IF NOT EXISTS ix_employees_search_trgm ON employees USING gin (({EMPLOYEE_SEARCH_DOCUMENT_SQL}) gin_trgm_ops)",
+    ],
+    "sqlite": [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS employees_fts USING fts5({_search_cols}, content='employees', content_rowid='id')",
+        f"CREATE TRIGGER IF NOT EXISTS employees_fts_ai AFTER INSERT ON employees BEGIN "
+        f"INSERT INTO employees_fts(rowid, {_search_cols}) VALUES (new.id, {_new_cols}); END",
+        f"CREATE TRIGGER IF NOT EXISTS employees_fts_ad AFTER DELETE ON employees BEGIN "
+        f"INSERT INTO employees_fts(employees_fts, rowid, {_search_cols}) VALUES ('delete', old.id, {_old_cols}); END",
+        f"CREATE TRIGGER IF NOT EXISTS employees_fts_au AFTER UPDATE ON employees BEGIN "
+        f"INSERT INTO employees_fts(employees_fts, rowid, {_search_cols}) VALUES ('delete', old.id, {_old_cols}); "
+        f"INSERT INTO employees_fts(rowid, {_search_cols}) VALUES (new.id, {_new_cols}); END",
+    ],
+}
+
+for _dialect, _statements in EMPLOYEE_SEARCH_DDL.items():
+    for _stmt in _statements:
+        event.listen(Employee.__table__, "after_create", DDL(_stmt).execute_if(dialect=_dialect))
+event.listen(Employee.__table__, "before_drop", DDL("DROP TABLE IF EXISTS employees_fts").execute_if(dialect="sqlite"))
+
 class AttendanceRecord(Base):
     __tablename__ = "attendance_records"
     id = Column(Integer, primary_key=True, index=True)
@@ -45,15 +88,57 @@ class AttendanceRecord(Base):
     check_in_time = Column(DateTime(timezone=True), nullable=True)
     check_out_time = Column(DateTime(timezone=True), nullable=True)
     status = Column(String(30), nullable=True)
-    __table_args__ = (UniqueConstraint('employee_id', 'date', name='_emp_date_uc'),)
+    __table_args__ = (
+        UniqueConstraint('employee_id', 'date', name='_emp_date_uc'),
+        # (employee_id, date) filters are served by _emp_date_uc; these back the other list shapes
+        Index('ix_attendance_records_date_id', 'date', 'id'),
+        Index('ix_attendance_records_emp_check_in', 'employee_id', 'check_in_time', 'id'),
+        Index('ix_attendance_records_emp_check_out', 'employee_id', 'check_out_time', 'id'),
+    )
 
     employee = relationship("Employee")
 
+# check_in_time / check_out_time are nullable and the list sorts them NULLS LAST
+# (app.pagination.keyset_order). A backward scan of the ASC indexes above gives
+# DESC NULLS FIRST on PostgreSQL, so descending sorts get their own indexes there.
+# SQLite orders NULLs first natively and serves both directions from the ASC index.
+ATTENDANCE_DESC_SORT_DDL = [
+    "CREATE INDEX IF NOT EXISTS ix_attendance_records_emp_check_in_desc "
+    "ON attendance_records (employee_id, check_in_time DESC NULLS LAST, id DESC)",
+    "CREATE INDEX IF NOT EXISTS ix_attendance_records_emp_check_out_desc "
+    "ON attendance_records (employee_id, check_out_time DESC NULLS LAST, id DESC)",
+]
+
+for _stmt in ATTENDANCE_DESC_SORT_DDL:
+    event.listen(AttendanceRecord.__table__, "after_create", DDL(_stmt).execute_if(dialect="postgresql"))
+
+class AttendanceDailySummary(Base):
+    __tablename__ = "attendance_daily_summary"
+    id = Column(Integer, primary_key=True, index=True)
+    employee_id = Column(Integer, ForeignKey("employees.id"), nullable=False)
+    date = Column(Date, nullable=False)
+    worked_seconds = Column(Integer, default=0, nullable=False)
+
+    __table_args__ = (UniqueConstraint("employee_id", "date", name="_daily_summary_emp_date_uc"),)
+
+class AttendanceMonthlySummary(Base):
+    __tablename__ = "attendance_monthly_summary"
+    id = Column(Integer, primary_key=True, index=True)
+    employee_id = Column(Integer, ForeignKey("employees.id"), nullable=False)
+    year = Column(Integer, nullable=False)
+    month = Column(Integer, nullable=False)
+    present_days = Column(Integer, default=0, nullable=False)
+    late_days = Column(Integer, default=0, nullable=False)
+    absent_days = Column(Integer, default=0, nullable=False)
+    worked_seconds = Column(Integer, default=0, nullable=False)
+
+    __table_args__ = (UniqueConstraint("employee_id", "year", "month", name="_monthly_summary_emp_month_uc"),)
+
 class Holiday(Base):
     __tablename__ = "holidays"
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(200), nullable=False)
-    date = Column(Date, nullable=False)
+    date = Column(Date, nullable=False, index=True)
     description = Column(String(500), nullable=True)
 
 class LeaveType(Base):
@@ -71,12 +156,22 @@ class LeaveRequest(Base):
     reason = Column(String(700), nullable=True)
     status = Column(Enum(LeaveStatus), default=LeaveStatus.pending)
     reviewed_by = Column(Integer, ForeignKey("employees.id"), nullable=True)
-    applied_at = Column(DateTime(timezone=True), server_default=func.now())
+    # written from Python so stored values round-trip exactly through /leave/list cursors
+    applied_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow, server_default=func.now())
     reviewed_at = Column(DateTime(timezone=True), nullable=True)
 
     employee = relationship("Employee", foreign_keys=[employee_id])
     leave_type = relationship("LeaveType")
 
+    __table_args__ = (
+        # covering on PostgreSQL so per-employee status counts are index-only
+        # (applied_at, id) is the /leave/list keyset; applied_at is NOT NULL so these serve both directions
+        Index('ix_leave_requests_emp_applied', 'employee_id', 'applied_at', 'id', postgresql_include=['status']),
+        Index('ix_leave_requests_applied', 'applied_at', 'id'),
+        # admin inbox: status filter + newest first
+        Index('ix_leave_requests_status_applied', 'status', 'applied_at', 'id'),
+    )
+
 
 class LeaveBalance(Base):
     __tablename__ = "leave_balance"
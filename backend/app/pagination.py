@@ -0,0 +1,100 @@
+import base64
+import json
+from datetime import date, datetime, timezone
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_, tuple_
+
+
+def encode_cursor(sort_key: str, value, row_id: int, direction: str) -> str:
+    """
+    Build an opaque cursor token pointing at a row.
+
+    direction is "next" (rows after the row) or "prev" (rows before it).
+    """
+    if isinstance(value, (date, datetime)):
+        value = value.isoformat()
+    raw = json.dumps({"k": sort_key, "v": value, "id": row_id, "d": direction}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str, sort_key: str, col):
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Returns (value, row_id, direction); value is converted back to the python type of col.
+    Raises 400 if the token is malformed or was issued for a different sort column.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        key, value, row_id, direction = data["k"], data["v"], int(data["id"]), data["d"]
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if key != sort_key or direction not in ("next", "prev"):
+        raise HTTPException(status_code=400, detail="Cursor does not match the requested sort")
+    if value is not None:
+        python_type = col.type.python_type
+        try:
+            if python_type is datetime:
+                value = datetime.fromisoformat(value)
+            elif python_type is date:
+                value = date.fromisoformat(value)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    return value, row_id, direction
+
+
+def keyset_order(col, id_col, descending: bool, backward: bool = False):
+    """
+    ORDER BY clauses for keyset pagination: (col, id) with NULLs always last.
+
+    Walking backward reverses the whole ordering; the caller reverses the page again.
+    NOT NULL columns get no NULLS clause so a plain (col, id) index can serve the sort.
+    """
+    reverse = descending != backward
+    first = col.desc() if reverse else col.asc()
+    if col.nullable:
+        first = first.nulls_first() if backward else first.nulls_last()
+    return [first, id_col.desc() if reverse else id_col.asc()]
+
+
+def keyset_filter(col, id_col, value, row_id: int, descending: bool, backward: bool = False):
+    """
+    WHERE clause selecting rows strictly after (or before, if backward) the row (value, row_id)
+    in the ordering produced by keyset_order(col, id_col, descending).
+
+    Only NOT NULL columns get a single index range; nullable ones need an OR with
+    the NULL rows, so deep pages there may cost more than the first.
+    """
+    ahead = descending == backward
+    if not col.nullable:
+        # row-value comparison, usable as an index range condition
+        key = tuple_(col, id_col)
+        return key > tuple_(value, row_id) if ahead else key < tuple_(value, row_id)
+
+    id_cmp = id_col > row_id if ahead else id_col < row_id
+    if value is None:
+        if backward:
+            return or_(col.isnot(None), id_cmp)
+        return and_(col.is_(None), id_cmp)
+
+    col_cmp = col > value if ahead else col < value
+    after = or_(col_cmp, and_(col == value, id_cmp))
+    if backward:
+        return and_(col.isnot(None), after)
+    return or_(after, col.is_(None))
+
+
+def keyset_sort_key(attr: str, descending: bool, backward: bool = False):
+    """
+    In-memory counterpart of keyset_order for rows with attributes attr and id:
+    returns (key, reverse) so that sorted(rows, key=key, reverse=reverse) gives
+    the same order. Datetimes compare as naive UTC.
+    """
+    def key(row):
+        value = getattr(row, attr)
+        if isinstance(value, datetime) and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return (value is not None if descending else value is None, value, row.id)
+    return key, descending != backward
@@ -0,0 +1,106 @@
+"""
+Monthly range partitions of attendance_records (PostgreSQL only).
+
+Migration 4e0c25b8c47c turns attendance_records into a table partitioned by
+RANGE (date) with one partition per month (attendance_records_YYYY_MM) and a
+DEFAULT partition that catches anything outside them. These helpers keep
+partitions ahead of today (ensure_partitions) and detach or drop months past
+retention (detach_before); manage_partitions.py is the CLI. On SQLite, or on a
+PostgreSQL database that hasn't been migrated, they do nothing.
+"""
+import re
+from datetime import date
+
+from sqlalchemy import text
+
+PARENT = "attendance_records"
+DEFAULT_PARTITION = f"{PARENT}_default"
+_NAME = re.compile(rf"^{PARENT}_(\d{{4}})_(\d{{2}})$")
+
+
+def partition_name(year: int, month: int) -> str:
+    return f"{PARENT}_{year:04d}_{month:02d}"
+
+
+def add_months(year: int, month: int, n: int):
+    index = year * 12 + (month - 1) + n
+    return index // 12, index % 12 + 1
+
+
+def month_range(first: date, last: date):
+    """(year, month) for every month from first's to last's, inclusive."""
+    year, month = first.year, first.month
+    while (year, month) <= (last.year, last.month):
+        yield year, month
+        year, month = add_months(year, month, 1)
+
+
+def is_partitioned(conn) -> bool:
+    if conn.dialect.name != "postgresql":
+        return False
+    return conn.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid "
+        "WHERE c.relname = :name AND c.relnamespace = current_schema()::regnamespace)"
+    ), {"name": PARENT}).scalar()
+
+
+def list_partitions(conn):
+    """Attached monthly partitions as sorted (year, month, name)."""
+    names = conn.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = :name AND p.relnamespace = current_schema()::regnamespace"
+    ), {"name": PARENT}).scalars()
+    found = []
+    for name in names:
+        m = _NAME.match(name)
+        if m:
+            found.append((int(m.group(1)), int(m.group(2)), name))
+    return sorted(found)
+
+
+def create_partition_sql(year: int, month: int) -> str:
+    ny, nm = add_months(year, month, 1)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(year, month)} PARTITION OF {PARENT} "
+        f"FOR VALUES FROM ('{year:04d}-{month:02d}-01') TO ('{ny:04d}-{nm:02d}-01')"
+    )
+
+
+def ensure_partitions(conn, months_ahead: int = 3, today: date = None) -> list:
+    """
+    Create monthly partitions from the current month through months_ahead
+    months later. Returns the names created. Rows for those months must not
+    already sit in the DEFAULT partition (PostgreSQL refuses the CREATE), which
+    running this regularly, ahead of time, avoids.
+    """
+    if not is_partitioned(conn):
+        return []
+    today = today or date.today()
+    existing = {(y, m) for y, m, _ in list_partitions(conn)}
+    last = add_months(today.year, today.month, months_ahead)
+    created = []
+    for year, month in month_range(today.replace(day=1), date(last[0], last[1], 1)):
+        if (year, month) not in existing:
+            conn.execute(text(create_partition_sql(year, month)))
+            created.append(partition_name(year, month))
+    return created
+
+
+def detach_before(conn, year: int, month: int, drop: bool = False) -> list:
+    """
+    Detach every monthly partition for months before (year, month). Detached
+    partitions stay behind as ordinary tables with the same name (out of every
+    query on attendance_records) until dropped; drop=True drops them right away.
+    """
+    if not is_partitioned(conn):
+        return []
+    done = []
+    for y, m, name in list_partitions(conn):
+        if (y, m) >= (year, month):
+            break
+        conn.execute(text(f"ALTER TABLE {PARENT} DETACH PARTITION {name}"))
+        if drop:
+            conn.execute(text(f"DROP TABLE {name}"))
+        done.append(name)
+    return done
@@ -0,0 +1,80 @@
+import threading
+import time
+
+from sqlalchemy import event, exc
+
+
+class PoolMetrics:
+    """Checkout counters for one engine's connection pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.overflow_checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.pool = None
+
+    def record_wait(self, seconds: float, overflow: bool):
+        with self._lock:
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            if overflow:
+                self.overflow_checkouts += 1
+
+    def record_timeout(self, seconds: float):
+        with self._lock:
+            self.timeouts += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def record_checkout(self):
+        with self._lock:
+            self.checkouts += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            stats = {
+                "checkouts": self.checkouts,
+                "overflow_checkouts": self.overflow_checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": round(self.wait_seconds_total, 6),
+                "wait_seconds_max": round(self.wait_seconds_max, 6),
+            }
+        pool = self.pool
+        stats["pool_class"] = type(pool).__name__ if pool is not None else None
+        # gauges only exist on QueuePool and its async variant
+        if pool is not None and hasattr(pool, "checkedout"):
+            stats.update(size=pool.size(), checked_out=pool.checkedout(), overflow=max(0, pool.overflow()))
+        return stats
+
+
+def instrumented_pool(base, metrics: PoolMetrics):
+    """
+    Subclass of a QueuePool-style pool class that times how long each checkout
+    waits for a connection and counts overflow use and timeouts.
+    """
+    def _do_get(self):
+        start = time.perf_counter()
+        overflow_before = self.overflow()
+        try:
+            conn = base._do_get(self)
+        except exc.TimeoutError:
+            metrics.record_timeout(time.perf_counter() - start)
+            raise
+        # overflow() only grows when this checkout opened a connection beyond pool_size
+        # (concurrent checkouts may blur this by one under contention)
+        opened_overflow = self.overflow() > max(overflow_before, 0)
+        metrics.record_wait(time.perf_counter() - start, opened_overflow)
+        return conn
+
+    return type(f"Instrumented{base.__name__}", (base,), {"_do_get": _do_get})
+
+
+def instrument_engine(engine, metrics: PoolMetrics):
+    """Count checkouts on any pool type and keep a handle for the gauges."""
+    metrics.pool = engine.pool
+    event.listen(engine, "checkout", lambda *args: metrics.record_checkout())
+    event.listen(engine, "engine_disposed", lambda e: setattr(metrics, "pool", e.pool))
+    return engine
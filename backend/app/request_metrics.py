@@ -0,0 +1,208 @@
+"""
+Per-request timing and SQL statement counting (enabled with settings.REQUEST_METRICS).
+
+RequestMetricsMiddleware is a plain ASGI middleware: it opens a RequestStats in a
+context variable, SQLAlchemy cursor events on every Engine (sync and the async
+engine's sync_engine) add each statement's count and time to it, and when the
+response starts it adds a Server-Timing header and records the request in the
+per-route histograms rendered by render_prometheus() for GET /metrics.
+"""
+import threading
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# request latency, seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# SQL statements per request; an N+1 shows up in the high buckets
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class RequestStats:
+    __slots__ = ("queries", "db_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+# shared by reference with threadpool workers (they run in a copy of the context)
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_stats() -> Optional[RequestStats]:
+    return _current.get()
+
+
+_scope: ContextVar[Optional[dict]] = ContextVar("request_scope", default=None)
+
+
+def current_route() -> Optional[str]:
+    """Route template ("/leave/{leave_id}/approve") of the request being served, once routed."""
+    scope = _scope.get()
+    route = scope.get("route") if scope is not None else None
+    return getattr(route, "path", None)
+
+
+class _Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+
+class _Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latency = {}   # (method, route, status) -> _Histogram
+        self.queries = {}   # (method, route) -> _Histogram
+        self.db_seconds = {}  # (method, route) -> float
+
+    def record(self, method: str, route: str, status: int, seconds: float, stats: RequestStats):
+        with self._lock:
+            self.latency.setdefault((method, route, str(status)), _Histogram(LATENCY_BUCKETS)).observe(seconds)
+            self.queries.setdefault((method, route), _Histogram(QUERY_BUCKETS)).observe(stats.queries)
+            self.db_seconds[(method, route)] = self.db_seconds.get((method, route), 0.0) + stats.db_seconds
+
+    def clear(self):
+        with self._lock:
+            self.latency.clear()
+            self.queries.clear()
+            self.db_seconds.clear()
+
+
+registry = _Registry()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("request_metrics_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    starts = conn.info.get("request_metrics_start")
+    if stats is None or not starts:
+        return
+    stats.queries += 1
+    stats.db_seconds += time.perf_counter() - starts.pop()
+
+
+def install_sql_listeners():
+    """Count statements on every engine; idempotent."""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class RequestScopeMiddleware:
+    """Only publishes the scope for current_route(); used by the slow-query log when REQUEST_METRICS is off."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        token = _scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _scope.reset(token)
+
+
+class RequestMetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+        install_sql_listeners()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        stats = RequestStats()
+        token = _current.set(stats)
+        scope_token = _scope.set(scope)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                total_ms = (time.perf_counter() - start) * 1000
+                value = (
+                    f'app;dur={total_ms:.1f}, '
+                    f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.queries} queries"'
+                )
+                message = {**message, "headers": [*message.get("headers", []), (b"server-timing", value.encode())]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            # Starlette puts the matched route into the scope while routing
+            template = current_route() or "unmatched"
+            registry.record(scope["method"], template, status, time.perf_counter() - start, stats)
+            _scope.reset(scope_token)
+            _current.reset(token)
+
+
+def _labels(**labels) -> str:
+    parts = []
+    for k, v in labels.items():
+        v = str(v).replace("\\", "\\\\").replace('"', '\\"')
+        parts.append(f'{k}="{v}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def _render_histogram(lines, name, histograms, label_names):
+    for key, h in sorted(histograms.items()):
+        labels = dict(zip(label_names, key))
+        for bound, count in zip(h.buckets, h.counts):
+            lines.append(f"{name}_bucket{_labels(**labels, le=bound)} {count}")
+        lines.append(f"{name}_bucket{_labels(**labels, le='+Inf')} {h.count}")
+        lines.append(f"{name}_sum{_labels(**labels)} {h.sum}")
+        lines.append(f"{name}_count{_labels(**labels)} {h.count}")
+
+
+def render_prometheus(pool_snapshots: dict, password_pool: dict) -> str:
+    """Prometheus text exposition of the request histograms plus pool gauges."""
+    lines = []
+    with registry._lock:
+        lines.append("# HELP http_request_duration_seconds Request latency by route template.")
+        lines.append("# TYPE http_request_duration_seconds histogram")
+        _render_histogram(lines, "http_request_duration_seconds", registry.latency, ("method", "route", "status"))
+        lines.append("# HELP http_request_sql_statements SQL statements executed per request.")
+        lines.append("# TYPE http_request_sql_statements histogram")
+        _render_histogram(lines, "http_request_sql_statements", registry.queries, ("method", "route"))
+        lines.append("# HELP http_request_db_seconds_total Time spent in SQL statements.")
+        lines.append("# TYPE http_request_db_seconds_total counter")
+        for (method, route), seconds in sorted(registry.db_seconds.items()):
+            lines.append(f"http_request_db_seconds_total{_labels(method=method, route=route)} {seconds}")
+
+    lines.append("# TYPE db_pool_checkouts_total counter")
+    lines.append("# TYPE db_pool_timeouts_total counter")
+    lines.append("# TYPE db_pool_wait_seconds_total counter")
+    lines.append("# TYPE db_pool_checked_out gauge")
+    for engine_name, snap in sorted(pool_snapshots.items()):
+        labels = _labels(engine=engine_name)
+        lines.append(f"db_pool_checkouts_total{labels} {snap['checkouts']}")
+        lines.append(f"db_pool_timeouts_total{labels} {snap['timeouts']}")
+        lines.append(f"db_pool_wait_seconds_total{labels} {snap['wait_seconds_total']}")
+        if "checked_out" in snap:
+            lines.append(f"db_pool_checked_out{labels} {snap['checked_out']}")
+
+    lines.append("# TYPE password_pool_queued gauge")
+    lines.append(f"password_pool_queued {password_pool.get('queued', 0)}")
+    lines.append("# TYPE password_pool_rejected_total counter")
+    lines.append(f"password_pool_rejected_total {password_pool.get('rejected', 0)}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,159 @@
+"""
+Response cache for read-heavy GET endpoints (settings.RESPONSE_CACHE_BACKEND).
+
+Entries are the serialized JSON body, keyed by namespace generation, route,
+query string and caller scope (e.g. "all" for admins/managers, "self:<id>" for
+an employee who only sees their own rows). Writers call invalidate(namespace),
+which bumps the namespace generation: every older key becomes unreachable at
+once and ages out through LRU / TTL. A reader that looked its key up before a
+write stores under the old generation, so it can't resurrect stale data.
+
+Backends: "memory" (per worker process; other workers see a write after at most
+RESPONSE_CACHE_TTL_SECONDS) and "redis" (shared, so invalidation is immediate
+everywhere). Anything with Redis' get / set(ex=) / incr can stand in for the
+client, see set_backend().
+"""
+from typing import Optional
+
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from starlette.responses import Response
+
+from app import models
+from app.cache import TTLCache
+from app.config import settings
+
+EMPLOYEES = "employees"
+HOLIDAYS = "holidays"
+LEAVES = "leaves"
+
+
+class MemoryBackend:
+    def __init__(self, maxsize: int, ttl: float):
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        # kept outside the LRU: an evicted generation would bring old entries back
+        self._generations = {}
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._entries.get(key)
+
+    def set(self, key: str, body: bytes):
+        self._entries.set(key, body)
+
+    def generation(self, namespace: str) -> int:
+        return self._generations.get(namespace, 0)
+
+    def bump(self, namespace: str):
+        # a lost increment under a race still moves the generation, which is all readers need
+        self._generations[namespace] = self._generations.get(namespace, 0) + 1
+
+
+class RedisBackend:
+    def __init__(self, client, ttl: float, prefix: str = "respcache:"):
+        self.client = client
+        self.ttl = int(ttl)
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, body: bytes):
+        self.client.set(self.prefix + key, body, ex=self.ttl)
+
+    def generation(self, namespace: str) -> int:
+        value = self.client.get(f"{self.prefix}gen:{namespace}")
+        return int(value) if value is not None else 0
+
+    def bump(self, namespace: str):
+        self.client.incr(f"{self.prefix}gen:{namespace}")
+
+
+_backend = None
+_configured = False
+
+
+def _from_settings():
+    kind = settings.RESPONSE_CACHE_BACKEND
+    if not kind:
+        return None
+    if kind == "memory":
+        return MemoryBackend(settings.RESPONSE_CACHE_SIZE, settings.RESPONSE_CACHE_TTL_SECONDS)
+    if kind == "redis":
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("RESPONSE_CACHE_BACKEND=redis needs the redis package (pip install redis)")
+        return RedisBackend(redis.Redis.from_url(settings.REDIS_URL), settings.RESPONSE_CACHE_TTL_SECONDS)
+    raise RuntimeError(f"unknown RESPONSE_CACHE_BACKEND {kind!r}")
+
+
+def get_backend():
+    global _backend, _configured
+    if not _configured:
+        _backend = _from_settings()
+        _configured = True
+    return _backend
+
+
+def set_backend(backend):
+    """Replace the configured backend (None disables caching)."""
+    global _backend, _configured
+    _backend = backend
+    _configured = True
+
+
+def scope_for(user) -> str:
+    """Caller scope for endpoints where employees only see their own rows."""
+    if user.role in (models.RoleEnum.admin, models.RoleEnum.manager):
+        return "all"
+    return f"self:{user.id}"
+
+
+def cache_key(namespace: str, request: Request, scope: str) -> Optional[str]:
+    """Key for this request, or None when caching is off. Look it up before querying."""
+    backend = get_backend()
+    if backend is None:
+        return None
+    query = "&".join(sorted(f"{k}={v}" for k, v in request.query_params.multi_items()))
+    return f"{namespace}:{backend.generation(namespace)}:{request.url.path}:{scope}:{query}"
+
+
+def get(key: Optional[str]) -> Optional[Response]:
+    if key is None:
+        return None
+    body = get_backend().get(key)
+    if body is None:
+        return None
+    return Response(content=body, media_type="application/json", headers={"X-Cache": "HIT"})
+
+
+def put(key: Optional[str], schema, result):
+    """
+    Validate result (dict or ORM object) against the route's response schema,
+    serialize it and store it under key; a Response is stored as is. With
+    caching off, result is returned untouched and FastAPI serializes it as before.
+    """
+    if key is None:
+        return result
+    if isinstance(result, Response):  # already serialized (fast_json)
+        response = result
+    else:
+        response = JSONResponse(jsonable_encoder(schema.validate(result)))
+    response.headers["X-Cache"] = "MISS"
+    get_backend().set(key, response.body)
+    return response
+
+
+def generation(namespace: str) -> Optional[int]:
+    backend = get_backend()
+    return backend.generation(namespace) if backend is not None else None
+
+
+def invalidate(*namespaces: str):
+    """Drop every cached response in the namespaces; call after the write commits."""
+    backend = get_backend()
+    if backend is None:
+        return
+    for namespace in namespaces:
+        backend.bump(namespace)
@@ -1,29 +1,35 @@
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from datetime import timedelta
 
 from app.database import get_db
 from app import models
-from app.auth import verify_password, create_access_token
+from app.auth import PasswordPoolBusy, verify_password_async, create_access_token
 from app.config import settings
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
 @router.post("/login")
-def login(
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
 ):
-    user = db.query(models.Employee).filter(
-        models.Employee.email == form_data.username
-    ).first()
+    # DB work stays on the threadpool, bcrypt runs on the dedicated password pool
+    user = await run_in_threadpool(
+        lambda: db.query(models.Employee).filter(models.Employee.email == form_data.username).first()
+    )
 
     if not user:
         raise HTTPException(status_code=400, detail="Invalid credentials")
 
-    if not verify_password(form_data.password, user.password_hash):
+    try:
+        valid = await verify_password_async(form_data.password, user.password_hash)
+    except PasswordPoolBusy:
+        raise HTTPException(status_code=503, detail="Server busy, retry shortly")
+    if not valid:
         raise HTTPException(status_code=400, detail="Invalid credentials")
 
     token = create_access_token(
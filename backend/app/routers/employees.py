@@ -1,24 +1,38 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from app.database import get_db
-from app import models, schemas
-from app.auth import hash_password
-from app.deps import get_current_user
+from app.database import get_db, run_db
+from app import employee_import, models, response_cache, schemas
+from app.auth import PasswordPoolBusy, hash_password_async
+from app.deps import get_current_user, invalidate_principal
+from app.config import settings
+from app.fast_json import fast_list_response, schema_columns
+from app.search import apply_ranked_search
 
 from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
 
 router = APIRouter(prefix="/employees", tags=["employees"])
 
+def _save(db: Session, obj):
+    db.add(obj)
+    db.commit()
+    db.refresh(obj)
+
 @router.post("/create", response_model=schemas.EmployeeOut)
-def create_employee(payload: schemas.EmployeeCreate, db: Session = Depends(get_db), user = Depends(get_current_user)):
+async def create_employee(payload: schemas.EmployeeCreate, db: Session = Depends(get_db), user = Depends(get_current_user)):
     # only admin can create
     if user.role != models.RoleEnum.admin:
         raise HTTPException(status_code=403, detail="Only admin can create employees")
-    existing = db.query(models.Employee).filter(models.Employee.email == payload.email).first()
+    existing = await run_db(
+        db, lambda session: session.query(models.Employee).filter(models.Employee.email == payload.email).first()
+    )
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
-    hashed = hash_password(payload.password)
+    try:
+        hashed = await hash_password_async(payload.password)
+    except PasswordPoolBusy:
+        raise HTTPException(status_code=503, detail="Server busy, retry shortly")
     emp = models.Employee(
         first_name=payload.first_name,
         last_name=payload.last_name,
@@ -29,16 +43,53 @@ def create_employee(payload: schemas.EmployeeCreate, db: Session = Depends(get_d
         department_id=payload.department_id,
         role=payload.role
     )
-    db.add(emp)
-    db.commit()
-    db.refresh(emp)
+    await run_db(db, _save, emp)
+    invalidate_principal(emp.id)
+    # leave lists embed employee names
+    response_cache.invalidate(response_cache.EMPLOYEES, response_cache.LEAVES)
     return emp
 
+@router.post("/import", response_model=schemas.EmployeeImportResponse)
+async def import_employees(
+    file: UploadFile = File(...),
+    fmt: Optional[str] = Query(None, alias="format"),
+    dry_run: bool = False,
+    db: Session = Depends(get_db),
+    user = Depends(get_current_user),
+):
+    """
+    Create employees from a CSV (header row of EmployeeCreate fields) or NDJSON
+    upload. format defaults from the file name / content type. Valid rows are
+    inserted together and the response reports every row (created / failed
+    with the reason); dry_run only validates. Admin only.
+    """
+    if user.role != models.RoleEnum.admin:
+        raise HTTPException(status_code=403, detail="Only admin can create employees")
+    fmt = fmt or employee_import.format_for(file.filename, file.content_type)
+    if fmt is None:
+        raise HTTPException(status_code=400, detail="format must be 'csv' or 'ndjson'")
+    try:
+        text = (await file.read()).decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="File must be UTF-8")
+    try:
+        return await employee_import.import_employees(
+            db, text, fmt, dry_run=dry_run, max_rows=settings.EMPLOYEE_IMPORT_MAX_ROWS,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except PasswordPoolBusy:
+        raise HTTPException(status_code=503, detail="Server busy, retry shortly")
+    except IntegrityError:
+        raise HTTPException(status_code=409, detail="An email was registered during the import; nothing was created, retry")
+
 @router.get("/list", response_model=schemas.EmployeeListResponse)
 def list_employees(
+    request: Request,
     skip: int = 0,
     limit: int = 50,
     q: Optional[str] = None,
+    search_mode: str = "basic",
     sort_by: Optional[str] = None,
     order: str = "asc",
     db: Session = Depends(get_db),
@@ -50,14 +101,25 @@ def list_employees(
     Params:
     - skip, limit : pagination
     - q : free-text search across first_name,last_name,email,phone,designation
+    - search_mode : 'basic' (substring ILIKE on each column) or 'ranked'
+      (index-backed: pg_trgm on PostgreSQL, FTS5 on SQLite; every word must match,
+      best matches first unless sort_by is given)
     - sort_by : one of allowed fields (first_name,last_name,email,designation,created_at)
     - order : 'asc' or 'desc'
+
+    Served from the response cache when enabled.
     """
     allowed_sort_fields = {"first_name", "last_name", "email", "designation", "created_at"}
 
     if order not in ("asc", "desc"):
         raise HTTPException(status_code=400, detail="order must be 'asc' or 'desc'")
+    if search_mode not in ("basic", "ranked"):
+        raise HTTPException(status_code=400, detail="search_mode must be 'basic' or 'ranked'")
 
+    cache_key = response_cache.cache_key(response_cache.EMPLOYEES, request, response_cache.scope_for(user))
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached
     query = db.query(models.Employee)
 
     # access control
@@ -65,7 +127,9 @@ def list_employees(
         query = query.filter(models.Employee.id == user.id)
 
     # search
-    if q:
+    if q and search_mode == "ranked":
+        query = apply_ranked_search(query, db, q, rank=not sort_by)
+    elif q:
         q_like = f"%{q}%"
         query = query.filter(
             or_(
@@ -88,12 +152,24 @@ def list_employees(
             query = query.order_by(col.desc())
 
     total = query.count()
+    if settings.FAST_LIST_RESPONSES:
+        rows = (
+            query.with_entities(*schema_columns(schemas.EmployeeOut, models.Employee))
+            .offset(skip).limit(limit).all()
+        )
+        response = fast_list_response(schemas.EmployeeListResponse, schemas.EmployeeOut, rows, total=total)
+        return response_cache.put(cache_key, schemas.EmployeeListResponse, response)
     items = query.offset(skip).limit(limit).all()
-    return {"total": total, "items": items}
+    return response_cache.put(cache_key, schemas.EmployeeListResponse, {"total": total, "items": items})
 
 @router.get("/{employee_id}", response_model=schemas.EmployeeOut)
-def get_employee(employee_id: int, db: Session = Depends(get_db), user = Depends(get_current_user)):
+def get_employee(employee_id: int, request: Request, db: Session = Depends(get_db), user = Depends(get_current_user)):
+    # any authenticated user may read any employee, so the cached entry is shared
+    cache_key = response_cache.cache_key(response_cache.EMPLOYEES, request, "any")
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached
     emp = db.query(models.Employee).filter(models.Employee.id==employee_id).first()
     if not emp:
         raise HTTPException(status_code=404, detail="Employee not found")
-    return emp
+    return response_cache.put(cache_key, schemas.EmployeeOut, emp)
@@ -1,7 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import date
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from app.database import get_db
-from app import models, schemas
+from app import holiday_calendar, models, response_cache, schemas
 from app.deps import get_current_user
 
 router = APIRouter(prefix="/holidays", tags=["holidays"])
@@ -13,9 +16,49 @@ def create_holiday(payload: schemas.HolidayCreate, db: Session = Depends(get_db)
     h = models.Holiday(name=payload.name, date=payload.date, description=payload.description)
     db.add(h)
     db.commit()
+    holiday_calendar.invalidate()
+    response_cache.invalidate(response_cache.HOLIDAYS)
     db.refresh(h)
     return h
 
+def _not_modified(request: Request, cal) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return cal.etag in [t.strip().removeprefix("W/") for t in if_none_match.split(",")] or if_none_match.strip() == "*"
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return cal.last_modified <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
 @router.get("/list")
-def list_holidays(db: Session = Depends(get_db)):
-    return db.query(models.Holiday).order_by(models.Holiday.date).all()
+def list_holidays(request: Request, db: Session = Depends(get_db)):
+    """
+    All holidays ordered by date, served from the in-process calendar.
+
+    Responses carry ETag / Last-Modified; conditional requests get 304.
+    """
+    cal = holiday_calendar.get_calendar(db)
+    headers = {
+        "ETag": cal.etag,
+        "Last-Modified": format_datetime(cal.last_modified, usegmt=True),
+        "Cache-Control": "no-cache",
+    }
+    if _not_modified(request, cal):
+        return Response(status_code=304, headers=headers)
+    return Response(content=cal.body, media_type="application/json", headers=headers)
+
+@router.get("/working-days", response_model=schemas.WorkingDaysOut)
+def working_days(start_date: date, end_date: date, db: Session = Depends(get_db)):
+    """Mon-Fri days in [start_date, end_date] that are not holidays."""
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="end_date must be on or after start_date")
+    cal = holiday_calendar.get_calendar(db)
+    return {
+        "start_date": start_date,
+        "end_date": end_date,
+        "working_days": cal.working_days(start_date, end_date),
+        "holidays": cal.holidays_between(start_date, end_date),
+    }
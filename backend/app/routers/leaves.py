@@ -1,12 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.orm import Session, joinedload
 from datetime import date, datetime
 from app.database import get_db
-from app import models, schemas
+from app import holiday_calendar, models, response_cache, schemas
 from app.deps import get_current_user
+from app.pagination import decode_cursor, encode_cursor, keyset_filter, keyset_order
+
+from typing import Optional
 
 from sqlalchemy.exc import NoResultFound
-from sqlalchemy import select
+from sqlalchemy import select, tuple_
 
 router = APIRouter(prefix="/leave", tags=["leave"])
 
@@ -25,14 +28,207 @@ def apply_leave(payload: schemas.LeaveRequestCreate, db: Session = Depends(get_d
     )
     db.add(lr)
     db.commit()
+    response_cache.invalidate(response_cache.LEAVES)
     db.refresh(lr)
     return lr
 
-@router.get("/list")
-def list_leaves(db: Session = Depends(get_db), user = Depends(get_current_user)):
+_LEAVE_SORT_FIELDS = {"applied_at", "start_date"}
+
+@router.get("/list", response_model=schemas.LeaveListResponse)
+def list_leaves(
+    request: Request,
+    limit: int = 100,
+    status: Optional[models.LeaveStatus] = None,
+    employee_id: Optional[int] = None,
+    leave_type_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    sort_by: str = "applied_at",
+    order: str = "desc",
+    cursor: Optional[str] = None,
+    include_total: Optional[bool] = None,
+    db: Session = Depends(get_db),
+    user = Depends(get_current_user),
+):
+    """
+    Keyset-paginated leave requests, newest first by default.
+
+    Admins/managers see everyone (optionally filtered by employee_id), employees
+    only their own. start_date/end_date select requests overlapping that range.
+    sort_by: applied_at | start_date, order: asc | desc. Pass next_cursor /
+    prev_cursor back as `cursor` with the same sort to move between pages.
+    Leave type and employee are loaded in the same query.
+    include_total: defaults to true on the first page and false with a cursor.
+    Served from the response cache when enabled.
+    """
+    if order not in ("asc", "desc"):
+        raise HTTPException(status_code=400, detail="order must be 'asc' or 'desc'")
+    if sort_by not in _LEAVE_SORT_FIELDS:
+        raise HTTPException(status_code=400, detail=f"Invalid sort_by field. Allowed: {sorted(list(_LEAVE_SORT_FIELDS))}")
+    cache_key = response_cache.cache_key(response_cache.LEAVES, request, response_cache.scope_for(user))
+    cached = response_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    LR = models.LeaveRequest
+    query = db.query(LR)
+
     if user.role in (models.RoleEnum.admin, models.RoleEnum.manager):
-        return db.query(models.LeaveRequest).order_by(models.LeaveRequest.applied_at.desc()).all()
-    return db.query(models.LeaveRequest).filter_by(employee_id=user.id).order_by(models.LeaveRequest.applied_at.desc()).all()
+        if employee_id:
+            query = query.filter(LR.employee_id == employee_id)
+    else:
+        query = query.filter(LR.employee_id == user.id)
+    if status:
+        query = query.filter(LR.status == status)
+    if leave_type_id:
+        query = query.filter(LR.leave_type_id == leave_type_id)
+    if start_date:
+        query = query.filter(LR.end_date >= start_date)
+    if end_date:
+        query = query.filter(LR.start_date <= end_date)
+
+    if include_total is None:
+        include_total = cursor is None
+    total = query.count() if include_total else None
+
+    col = getattr(LR, sort_by)
+    descending = order == "desc"
+    backward = False
+    if cursor:
+        value, last_id, direction = decode_cursor(cursor, sort_by, col)
+        backward = direction == "prev"
+        query = query.filter(keyset_filter(col, LR.id, value, last_id, descending, backward))
+
+    rows = (
+        query.options(joinedload(LR.leave_type), joinedload(LR.employee))
+        .order_by(*keyset_order(col, LR.id, descending, backward))
+        .limit(limit + 1)
+        .all()
+    )
+    has_more = len(rows) > limit
+    items = rows[:limit]
+    if backward:
+        items.reverse()
+    has_next = True if backward else has_more
+    has_prev = has_more if backward else bool(cursor)
+
+    next_cursor = prev_cursor = None
+    if items:
+        first, last = items[0], items[-1]
+        if has_next:
+            next_cursor = encode_cursor(sort_by, getattr(last, sort_by), last.id, "next")
+        if has_prev:
+            prev_cursor = encode_cursor(sort_by, getattr(first, sort_by), first.id, "prev")
+    result = {"total": total, "items": items, "next_cursor": next_cursor, "prev_cursor": prev_cursor}
+    return response_cache.put(cache_key, schemas.LeaveListResponse, result)
+
+# max ranges per preview request
+_PREVIEW_MAX_ITEMS = 1000
+
+@router.post("/preview-cost", response_model=schemas.LeaveCostPreviewResponse)
+def preview_leave_cost(payload: schemas.LeaveCostPreviewRequest, db: Session = Depends(get_db), user = Depends(get_current_user)):
+    """Days each range would be charged on approval (working days, weekends and holidays excluded)."""
+    if len(payload.items) > _PREVIEW_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {_PREVIEW_MAX_ITEMS} items per request")
+    if any(item.start_date > item.end_date for item in payload.items):
+        raise HTTPException(status_code=400, detail="start_date must be <= end_date")
+    cal = holiday_calendar.get_calendar(db)
+    return {"items": [
+        {
+            "start_date": item.start_date,
+            "end_date": item.end_date,
+            "calendar_days": (item.end_date - item.start_date).days + 1,
+            "working_days": cal.working_days(item.start_date, item.end_date),
+        }
+        for item in payload.items
+    ]}
+
+def _new_balance(employee_id: int, year: int):
+    return models.LeaveBalance(employee_id=employee_id, year=year, total_leaves=17, used_leaves=0, remaining_leaves=17)
+
+# max leave ids per bulk review
+_BULK_REVIEW_MAX_ITEMS = 5000
+
+@router.post("/bulk-review", response_model=schemas.BulkLeaveReviewResponse)
+def bulk_review_leaves(payload: schemas.BulkLeaveReviewRequest, db: Session = Depends(get_db), user = Depends(get_current_user)):
+    """
+    Approve or reject many pending leave requests in one transaction.
+
+    Leave rows are locked in id order, then balance rows in (employee_id, year)
+    order, the same leave-then-balance order as the single approve, so
+    concurrent reviews cannot deadlock. Balances are checked in memory in
+    leave id order; items that fail are reported and left pending, the rest
+    are committed together.
+    """
+    if user.role not in (models.RoleEnum.admin, models.RoleEnum.manager):
+        raise HTTPException(status_code=403, detail="Only admin/manager can review leave")
+    leave_ids = list(dict.fromkeys(payload.leave_ids))
+    if len(leave_ids) > _BULK_REVIEW_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {_BULK_REVIEW_MAX_ITEMS} leave ids per request")
+    approve = payload.action == schemas.LeaveAction.approve
+
+    try:
+        leaves = {
+            lr.id: lr for lr in db.query(models.LeaveRequest)
+            .filter(models.LeaveRequest.id.in_(leave_ids))
+            .order_by(models.LeaveRequest.id)
+            .with_for_update()
+        }
+        pending = sorted(i for i, lr in leaves.items() if lr.status == models.LeaveStatus.pending)
+
+        balances = {}
+        costs = {}
+        if approve and pending:
+            cal = holiday_calendar.get_calendar(db)
+            for i in pending:
+                lr = leaves[i]
+                costs[i] = cal.working_days(lr.start_date, lr.end_date)
+            keys = sorted({(leaves[i].employee_id, leaves[i].start_date.year) for i in pending})
+            B = models.LeaveBalance
+            for b in (db.query(B).filter(tuple_(B.employee_id, B.year).in_(keys))
+                      .order_by(B.employee_id, B.year).with_for_update()):
+                balances[(b.employee_id, b.year)] = b
+            for key in keys:
+                if key not in balances:
+                    balances[key] = _new_balance(*key)
+                    db.add(balances[key])
+
+        now = datetime.utcnow()
+        results = {}
+        for i in sorted(leave_ids):
+            lr = leaves.get(i)
+            if lr is None:
+                results[i] = {"leave_id": i, "status": "failed", "detail": "Leave request not found"}
+                continue
+            if lr.status != models.LeaveStatus.pending:
+                results[i] = {"leave_id": i, "status": "failed", "detail": "Leave request not pending"}
+                continue
+            if approve:
+                balance = balances[(lr.employee_id, lr.start_date.year)]
+                if balance.remaining_leaves < costs[i]:
+                    results[i] = {
+                        "leave_id": i, "status": "failed", "remaining_leaves": balance.remaining_leaves,
+                        "detail": f"Insufficient leave balance (remaining {balance.remaining_leaves})",
+                    }
+                    continue
+                balance.used_leaves += costs[i]
+                balance.remaining_leaves = balance.total_leaves - balance.used_leaves
+                lr.status = models.LeaveStatus.approved
+                results[i] = {"leave_id": i, "status": "approved", "remaining_leaves": balance.remaining_leaves}
+            else:
+                lr.status = models.LeaveStatus.rejected
+                results[i] = {"leave_id": i, "status": "rejected"}
+            lr.reviewed_by = user.id
+            lr.reviewed_at = now
+
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    response_cache.invalidate(response_cache.LEAVES)
+
+    ordered = [results[i] for i in leave_ids]
+    failed = sum(1 for r in ordered if r["status"] == "failed")
+    return {"succeeded": len(ordered) - failed, "failed": failed, "results": ordered}
 
 @router.put("/{leave_id}/approve")
 # Only admin/manager can approve
@@ -46,7 +242,8 @@ def approve_leave(leave_id: int, db: Session = Depends(get_db), user = Depends(g
     if lr.status != models.LeaveStatus.pending:
         raise HTTPException(status_code=400, detail="Leave request not pending")
 
-    requested_days = (lr.end_date - lr.start_date).days + 1
+    # weekends and holidays are not charged
+    requested_days = holiday_calendar.get_calendar(db).working_days(lr.start_date, lr.end_date)
     year = lr.start_date.year
 
     # start transaction
@@ -54,7 +251,7 @@ def approve_leave(leave_id: int, db: Session = Depends(get_db), user = Depends(g
         # lock or create balance row
         balance = db.query(models.LeaveBalance).filter_by(employee_id=lr.employee_id, year=year).with_for_update().first()
         if not balance:
-            balance = models.LeaveBalance(employee_id=lr.employee_id, year=year, total_leaves=17, used_leaves=0, remaining_leaves=17)
+            balance = _new_balance(lr.employee_id, year)
             db.add(balance)
             db.flush()  # ensure we have the row and it's locked
 
@@ -69,6 +266,7 @@ def approve_leave(leave_id: int, db: Session = Depends(get_db), user = Depends(g
         balance.remaining_leaves = balance.total_leaves - balance.used_leaves
 
         db.commit()
+        response_cache.invalidate(response_cache.LEAVES)
         db.refresh(lr)
         db.refresh(balance)
     except Exception:
@@ -88,5 +286,6 @@ def reject_leave(leave_id: int, db: Session = Depends(get_db), user = Depends(ge
     lr.reviewed_by = user.id
     lr.reviewed_at = datetime.utcnow()
     db.commit()
+    response_cache.invalidate(response_cache.LEAVES)
     db.refresh(lr)
     return lr
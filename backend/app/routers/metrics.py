@@ -0,0 +1,45 @@
+import secrets
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.orm import Session
+from app import models
+from app.auth import password_pool_stats
+from app.config import settings
+from app.database import get_db, pool_metrics
+from app.deps import get_current_user
+from app.request_metrics import render_prometheus
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+@router.get("", response_class=PlainTextResponse)
+def prometheus(request: Request, db: Session = Depends(get_db)):
+    """Prometheus text format; 404 unless REQUEST_METRICS is on."""
+    if not settings.REQUEST_METRICS:
+        raise HTTPException(status_code=404, detail="Not Found")
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        raise HTTPException(status_code=401, detail="Not authenticated", headers={"WWW-Authenticate": "Bearer"})
+    scraper = settings.METRICS_SCRAPE_TOKEN
+    if not (scraper and secrets.compare_digest(token, scraper)):
+        user = get_current_user(token=token, db=db)
+        if user.role != models.RoleEnum.admin:
+            raise HTTPException(status_code=403, detail="Only admin can view metrics")
+    pools = {name: metrics.snapshot() for name, metrics in pool_metrics.items()}
+    return PlainTextResponse(
+        render_prometheus(pools, password_pool_stats()),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+@router.get("/password-pool")
+def password_pool(user = Depends(get_current_user)):
+    if user.role != models.RoleEnum.admin:
+        raise HTTPException(status_code=403, detail="Only admin can view metrics")
+    return password_pool_stats()
+
+@router.get("/db-pool")
+def db_pool(user = Depends(get_current_user)):
+    """Connection pool counters and gauges per engine (sync, and async once used)."""
+    if user.role != models.RoleEnum.admin:
+        raise HTTPException(status_code=403, detail="Only admin can view metrics")
+    return {name: metrics.snapshot() for name, metrics in pool_metrics.items()}
@@ -0,0 +1,90 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from datetime import date
+from typing import Optional
+from app.database import get_db
+from app import dashboard, models, schemas
+from app.deps import get_current_user
+
+router = APIRouter(prefix="/reports", tags=["reports"])
+
+@router.get("/daily", response_model=schemas.DailySummaryListResponse)
+def daily_report(
+    start_date: date,
+    end_date: date,
+    employee_id: Optional[int] = None,
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db),
+    user = Depends(get_current_user),
+):
+    """
+    Worked seconds per employee per day, read from attendance_daily_summary.
+    Employees only see their own rows.
+    """
+    if start_date > end_date:
+        raise HTTPException(status_code=400, detail="start_date must be <= end_date")
+    Daily = models.AttendanceDailySummary
+    query = db.query(Daily).filter(Daily.date >= start_date, Daily.date <= end_date)
+    if user.role == models.RoleEnum.employee:
+        query = query.filter(Daily.employee_id == user.id)
+    elif employee_id:
+        query = query.filter(Daily.employee_id == employee_id)
+
+    total = query.count()
+    items = query.order_by(Daily.date, Daily.employee_id).offset(skip).limit(limit).all()
+    return {"total": total, "items": items}
+
+@router.get("/monthly", response_model=schemas.MonthlySummaryListResponse)
+def monthly_report(
+    year: int,
+    month: int,
+    employee_id: Optional[int] = None,
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db),
+    user = Depends(get_current_user),
+):
+    """
+    Present / late / absent day counts and worked seconds per employee for one month,
+    read from attendance_monthly_summary (one row per employee).
+    Employees only see their own row.
+    """
+    if not 1 <= month <= 12:
+        raise HTTPException(status_code=400, detail="month must be between 1 and 12")
+    Monthly = models.AttendanceMonthlySummary
+    query = db.query(Monthly).filter(Monthly.year == year, Monthly.month == month)
+    if user.role == models.RoleEnum.employee:
+        query = query.filter(Monthly.employee_id == user.id)
+    elif employee_id:
+        query = query.filter(Monthly.employee_id == employee_id)
+
+    total = query.count()
+    items = query.order_by(Monthly.employee_id).offset(skip).limit(limit).all()
+    return {"total": total, "items": items}
+
+@router.get("/department", response_model=schemas.DepartmentDashboardOut)
+def department_dashboard(
+    department_id: Optional[int] = None,
+    period: str = dashboard.TODAY,
+    db: Session = Depends(get_db),
+    user = Depends(get_current_user),
+):
+    """
+    Present / late / on-leave / absent counts and per-member status for one
+    department, today or this week (Monday through today). Admins pick any
+    department; managers get their own. Cached for DASHBOARD_CACHE_SECONDS.
+    """
+    if user.role not in (models.RoleEnum.admin, models.RoleEnum.manager):
+        raise HTTPException(status_code=403, detail="Only admin or manager can view department dashboards")
+    if period not in dashboard.PERIODS:
+        raise HTTPException(status_code=400, detail=f"period must be one of {list(dashboard.PERIODS)}")
+    if department_id is None:
+        department_id = user.department_id
+    if department_id is None:
+        raise HTTPException(status_code=400, detail="department_id is required")
+    if user.role == models.RoleEnum.manager and department_id != user.department_id:
+        raise HTTPException(status_code=403, detail="Managers can only view their own department")
+    if db.get(models.Department, department_id) is None:
+        raise HTTPException(status_code=404, detail="Department not found")
+    return dashboard.department_summary(db, department_id, period)
@@ -44,6 +44,12 @@ class HolidayCreate(BaseModel):
     date: date
     description: Optional[str] = None
 
+class WorkingDaysOut(BaseModel):
+    start_date: date
+    end_date: date
+    working_days: int
+    holidays: int  # holidays that fall on a weekday in the range
+
 class LeaveTypeOut(BaseModel):
     id: int
     name: str
@@ -56,6 +62,20 @@ class LeaveRequestCreate(BaseModel):
     end_date: date
     reason: Optional[str] = None
 
+class LeaveRange(BaseModel):
+    start_date: date
+    end_date: date
+
+class LeaveCostPreviewRequest(BaseModel):
+    items: List[LeaveRange]
+
+class LeaveCost(LeaveRange):
+    calendar_days: int
+    working_days: int  # what approval would deduct from the balance
+
+class LeaveCostPreviewResponse(BaseModel):
+    items: List[LeaveCost]
+
 class LeaveRequestOut(BaseModel):
     id: int
     employee_id: int
@@ -66,6 +86,28 @@ class LeaveRequestOut(BaseModel):
     class Config:
         orm_mode = True
 
+class EmployeeBrief(BaseModel):
+    id: int
+    first_name: str
+    last_name: Optional[str] = None
+    email: EmailStr
+    class Config:
+        orm_mode = True
+
+class LeaveListItem(LeaveRequestOut):
+    leave_type_id: int
+    reason: Optional[str] = None
+    reviewed_by: Optional[int] = None
+    applied_at: Optional[datetime] = None
+    reviewed_at: Optional[datetime] = None
+    employee: EmployeeBrief
+
+class LeaveListResponse(BaseModel):
+    total: Optional[int] = None
+    items: List[LeaveListItem]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
 class EmployeeListResponse(BaseModel):
     total: int
     items: List['EmployeeOut']  # forward ref
@@ -85,11 +127,121 @@ class AttendanceOut(BaseModel):
         orm_mode = True
 
 class AttendanceListResponse(BaseModel):
-    total: int
+    total: Optional[int] = None
     items: List[AttendanceOut]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
 
     class Config:
         orm_mode = True
 
+class PunchDirection(str, Enum):
+    check_in = "in"
+    check_out = "out"
+
+class PunchEvent(BaseModel):
+    employee_id: int
+    timestamp: datetime
+    direction: PunchDirection
+
+class BulkPunchRequest(BaseModel):
+    events: List[PunchEvent]
+
+class PunchResult(BaseModel):
+    index: int
+    employee_id: int
+    date: date
+    direction: PunchDirection
+    status: str  # applied | duplicate | rejected
+    detail: Optional[str] = None
+
+class BulkPunchResponse(BaseModel):
+    applied: int
+    rejected: int
+    results: List[PunchResult]
+
+class LeaveAction(str, Enum):
+    approve = "approve"
+    reject = "reject"
+
+class BulkLeaveReviewRequest(BaseModel):
+    leave_ids: List[int]
+    action: LeaveAction
+
+class LeaveReviewResult(BaseModel):
+    leave_id: int
+    status: str  # approved | rejected | failed
+    detail: Optional[str] = None
+    remaining_leaves: Optional[int] = None
+
+class BulkLeaveReviewResponse(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[LeaveReviewResult]
+
+class EmployeeImportResult(BaseModel):
+    line: int
+    email: Optional[str] = None
+    status: str  # created | valid (dry run) | failed
+    id: Optional[int] = None
+    detail: Optional[str] = None
+
+class EmployeeImportResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[EmployeeImportResult]
+
+class DailySummaryOut(BaseModel):
+    employee_id: int
+    date: date
+    worked_seconds: int
+
+    class Config:
+        orm_mode = True
+
+class DailySummaryListResponse(BaseModel):
+    total: int
+    items: List[DailySummaryOut]
+
+class MonthlySummaryOut(BaseModel):
+    employee_id: int
+    year: int
+    month: int
+    present_days: int
+    late_days: int
+    absent_days: int
+    worked_seconds: int
+
+    class Config:
+        orm_mode = True
+
+class MonthlySummaryListResponse(BaseModel):
+    total: int
+    items: List[MonthlySummaryOut]
+
+class DepartmentMemberOut(BaseModel):
+    id: int
+    first_name: str
+    last_name: Optional[str] = None
+    # today's status: present, late, on_leave, absent (not checked in), holiday or off
+    status: Optional[str] = None
+    present_days: int
+    late_days: int
+    on_leave_days: int
+    absent_days: int
+
+class DepartmentDashboardOut(BaseModel):
+    department_id: int
+    period: str
+    start_date: date
+    end_date: date
+    members_total: int
+    # member-days over the period (= members for period=today); late is part of present
+    present: int
+    late: int
+    on_leave: int
+    absent: int
+    members: List[DepartmentMemberOut]
+
 # forward refs resolution (if using forward refs for EmployeeOut)
 EmployeeListResponse.update_forward_refs()
@@ -0,0 +1,46 @@
+import re
+
+from fastapi import HTTPException
+from sqlalchemy import String, column, false, func, literal_column, table
+
+from app import models
+
+# FTS5 table created alongside employees on SQLite (see models.EMPLOYEE_SEARCH_DDL)
+_employees_fts = table("employees_fts", column("rowid"), column("rank"))
+
+
+def _tokens(q: str):
+    return re.findall(r"\w+", q.lower())
+
+
+def apply_ranked_search(query, db, q: str, rank: bool = True):
+    """
+    Filter an Employee query by the indexed directory search.
+
+    Every word in q must match (as a substring on PostgreSQL, as a word prefix on
+    SQLite). When rank is true results are ordered best match first.
+    """
+    tokens = _tokens(q)
+    if not tokens:
+        return query.filter(false())
+    dialect = db.get_bind().dialect.name
+
+    if dialect == "postgresql":
+        # same text as the indexed expression, so the trigram GIN index is used
+        document = literal_column(models.EMPLOYEE_SEARCH_DOCUMENT_SQL, String)
+        for tok in tokens:
+            query = query.filter(document.like(f"%{tok.replace('_', '/_')}%", escape="/"))
+        if rank:
+            query = query.order_by(func.word_similarity(" ".join(tokens), document).desc(), models.Employee.id)
+        return query
+
+    if dialect == "sqlite":
+        match = " ".join(f'"{tok}"*' for tok in tokens)
+        query = query.join(_employees_fts, _employees_fts.c.rowid == models.Employee.id).filter(
+            literal_column("employees_fts").op("MATCH")(match)
+        )
+        if rank:
+            query = query.order_by(_employees_fts.c.rank, models.Employee.id)
+        return query
+
+    raise HTTPException(status_code=400, detail="Ranked search is not available on this database")
@@ -0,0 +1,203 @@
+"""
+Slow-query log (enabled with settings.SLOW_QUERY_MS > 0).
+
+Cursor events time every statement on the instrumented engines. Statements slower
+than the threshold are handed to a single background thread that runs EXPLAIN on
+a separate connection (SELECT / WITH statements only) and writes one
+JSON line per statement: duration, SQL, bound parameters, the route being served
+and the plan. The log rotates at SLOW_QUERY_LOG_MAX_BYTES.
+"""
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+
+from sqlalchemy import event
+
+from app.config import settings
+from app.request_metrics import current_route
+
+_MAX_PARAM_CHARS = 200
+# bounded so a storm of slow queries can't pile up EXPLAINs behind a slow database
+_MAX_PENDING = 100
+_REDACTED_PARAMS = ("password",)
+
+_executor = None
+_lock = threading.Lock()
+_pending = 0
+_explaining = threading.local()
+_logger = None
+
+
+def build_logger(path: str, max_bytes: int, backups: int) -> logging.Logger:
+    log = logging.getLogger(f"app.slow_queries.{path}")
+    log.setLevel(logging.INFO)
+    log.propagate = False
+    if not log.handlers:
+        handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        log.addHandler(handler)
+    return log
+
+
+def _default_logger() -> logging.Logger:
+    global _logger
+    if _logger is None:
+        _logger = build_logger(
+            settings.SLOW_QUERY_LOG_PATH, settings.SLOW_QUERY_LOG_MAX_BYTES, settings.SLOW_QUERY_LOG_BACKUPS,
+        )
+    return _logger
+
+
+def _short(value):
+    if isinstance(value, (bytes, bytearray)):
+        return f"<{len(value)} bytes>"
+    text = value if isinstance(value, (int, float, bool)) or value is None else str(value)
+    if isinstance(text, str) and len(text) > _MAX_PARAM_CHARS:
+        return text[:_MAX_PARAM_CHARS] + "..."
+    return text
+
+
+def _loggable_params(parameters, context):
+    """Named bind parameters when the statement was compiled, else the DBAPI ones; secrets masked."""
+    compiled = getattr(context, "compiled_parameters", None)
+    if compiled and len(compiled) == 1:
+        return {
+            k: "***" if any(s in k for s in _REDACTED_PARAMS) else _short(v)
+            for k, v in compiled[0].items()
+        }
+    if isinstance(parameters, dict):
+        return {k: _short(v) for k, v in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (list, tuple, dict)):
+            return f"<executemany x{len(parameters)}>"
+        return [_short(v) for v in parameters]
+    return None
+
+
+def _explain_sql(dialect_name: str, statement: str):
+    if dialect_name == "postgresql":
+        return "EXPLAIN (FORMAT JSON) " + statement
+    if dialect_name == "sqlite":
+        return "EXPLAIN QUERY PLAN " + statement
+    return None
+
+
+def _explain_target(conn, statement, parameters, context, executemany):
+    """(engine, sql, params) to run EXPLAIN with, or None when the statement can't be explained safely."""
+    if executemany or not statement.lstrip()[:6].upper().startswith(("SELECT", "WITH")):
+        return None
+    if not getattr(conn.dialect, "is_async", False):
+        sql = _explain_sql(conn.dialect.name, statement)
+        return (conn.engine, sql, parameters) if sql else None
+    # the async drivers can't be driven from a plain thread; recompile for the sync engine instead
+    compiled = getattr(context, "compiled", None)
+    if compiled is None or compiled.statement is None:
+        return None
+    from app.database import engine
+    recompiled = compiled.statement.compile(dialect=engine.dialect)
+    params = recompiled.construct_params(context.compiled_parameters[0] if context.compiled_parameters else None)
+    if recompiled.positional:
+        params = tuple(params[name] for name in recompiled.positiontup)
+    sql = _explain_sql(engine.dialect.name, str(recompiled))
+    return (engine, sql, params) if sql else None
+
+
+def _run_explain(target):
+    engine, sql, params = target
+    _explaining.active = True
+    try:
+        with engine.connect() as conn:
+            rows = conn.exec_driver_sql(sql, params).fetchall()
+    finally:
+        _explaining.active = False
+    if engine.dialect.name == "postgresql":
+        return rows[0][0]
+    # EXPLAIN QUERY PLAN: (id, parent, notused, detail)
+    return [row[-1] for row in rows]
+
+
+def _write(log, entry, target):
+    global _pending
+    try:
+        if target is not None:
+            try:
+                entry["plan"] = _run_explain(target)
+            except Exception as e:  # the statement may reference a temp table or a since-dropped row
+                entry["explain_error"] = f"{type(e).__name__}: {e}"
+        log.info(json.dumps(entry, default=str))
+    finally:
+        with _lock:
+            _pending -= 1
+
+
+def _submit(log, entry, target):
+    global _executor, _pending
+    with _lock:
+        if _pending >= _MAX_PENDING:
+            entry["explain_error"] = "skipped: explain queue full"
+            log.info(json.dumps(entry, default=str))
+            return
+        _pending += 1
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+        _executor.submit(_write, log, entry, target)
+
+
+def install(engine, threshold_ms: float = None, log: logging.Logger = None, explain: bool = None):
+    """
+    Time statements on engine (a sync Engine, or an AsyncEngine's sync_engine).
+    Returns a function that removes the listeners again.
+    """
+    threshold_ms = settings.SLOW_QUERY_MS if threshold_ms is None else threshold_ms
+    if threshold_ms <= 0:
+        return lambda: None
+    explain = settings.SLOW_QUERY_EXPLAIN if explain is None else explain
+    threshold = threshold_ms / 1000
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("slow_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _finish(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("slow_query_start")
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+        if elapsed < threshold or getattr(_explaining, "active", False):
+            return
+        entry = {
+            "ts": datetime.now(timezone.utc).isoformat(),
+            "duration_ms": round(elapsed * 1000, 3),
+            "route": current_route(),
+            "statement": statement,
+            "parameters": _loggable_params(parameters, context),
+        }
+        target = _explain_target(conn, statement, parameters, context, executemany) if explain else None
+        _submit(log or _default_logger(), entry, target)
+
+    def remove():
+        event.remove(engine, "before_cursor_execute", _start)
+        event.remove(engine, "after_cursor_execute", _finish)
+
+    return remove
+
+
+def flush(timeout: float = 10):
+    """Wait for queued EXPLAINs to be written (tests, shutdown)."""
+    with _lock:
+        executor = _executor
+    if executor is not None:
+        executor.submit(lambda: None).result(timeout=timeout)
+
+
+def shutdown():
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=False)
@@ -0,0 +1,144 @@
+"""
+Attendance summary tables.
+
+attendance_daily_summary holds worked seconds per employee per day and
+attendance_monthly_summary holds present/late/absent day counts per employee
+per month. A day is counted once it is closed, i.e. when check-out is written;
+record_checkouts() applies that incrementally and refresh_month() rebuilds a
+month from attendance_records (backfill, absence job), plus the month's
+archive file if it has been archived (app.archive).
+"""
+from datetime import date, timedelta, timezone
+from itertools import chain
+
+from app import models
+from app.config import settings
+from app.database import dialect_insert
+
+# rows per INSERT while rebuilding a month
+_CHUNK = 5000
+
+
+def as_naive_utc(ts):
+    # check-in/out times are written as naive UTC; PostgreSQL hands them back tz-aware
+    if ts is not None and ts.tzinfo is not None:
+        return ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return ts
+
+
+def worked_seconds(check_in_time, check_out_time) -> int:
+    if check_in_time is None or check_out_time is None:
+        return 0
+    delta = as_naive_utc(check_out_time) - as_naive_utc(check_in_time)
+    return max(0, int(delta.total_seconds()))
+
+
+def is_late(check_in_time) -> bool:
+    return check_in_time is not None and as_naive_utc(check_in_time).time() > settings.LATE_CHECK_IN_AFTER
+
+
+def record_checkouts(db, records):
+    """
+    Fold freshly closed days into the summary tables with two upserts.
+
+    records: iterable of (employee_id, date, check_in_time, check_out_time).
+    Does not commit; call inside the transaction that writes check_out_time.
+    """
+    daily = []
+    monthly = {}
+    for emp_id, day, check_in_time, check_out_time in records:
+        seconds = worked_seconds(check_in_time, check_out_time)
+        daily.append({"employee_id": emp_id, "date": day, "worked_seconds": seconds})
+        m = monthly.setdefault((emp_id, day.year, day.month), {"present_days": 0, "late_days": 0, "worked_seconds": 0})
+        m["present_days"] += 1
+        m["late_days"] += int(is_late(check_in_time))
+        m["worked_seconds"] += seconds
+    if not daily:
+        return
+
+    insert = dialect_insert(db.get_bind())
+    table = models.AttendanceDailySummary.__table__
+    stmt = insert(table).values(daily)
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[table.c.employee_id, table.c.date],
+        set_={"worked_seconds": stmt.excluded.worked_seconds},
+    ))
+
+    table = models.AttendanceMonthlySummary.__table__
+    rows = [
+        {"employee_id": emp_id, "year": year, "month": month, "absent_days": 0, **counts}
+        for (emp_id, year, month), counts in sorted(monthly.items())
+    ]
+    stmt = insert(table).values(rows)
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[table.c.employee_id, table.c.year, table.c.month],
+        set_={
+            "present_days": table.c.present_days + stmt.excluded.present_days,
+            "late_days": table.c.late_days + stmt.excluded.late_days,
+            "worked_seconds": table.c.worked_seconds + stmt.excluded.worked_seconds,
+        },
+    ))
+
+
+def month_bounds(year: int, month: int):
+    start = date(year, month, 1)
+    end = (start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    return start, end
+
+
+def refresh_month(db, year: int, month: int):
+    """
+    Rebuild both summary tables for one month from attendance_records.
+
+    Streams the month's rows, so memory is bounded by the number of employees
+    rather than the number of records (an archived month's file is read whole).
+    Does not commit.
+    """
+    start, end = month_bounds(year, month)
+    Rec = models.AttendanceRecord
+    Daily = models.AttendanceDailySummary
+    Monthly = models.AttendanceMonthlySummary
+
+    db.query(Daily).filter(Daily.date >= start, Daily.date <= end).delete(synchronize_session=False)
+    db.query(Monthly).filter(Monthly.year == year, Monthly.month == month).delete(synchronize_session=False)
+
+    from app import archive
+    rows = chain(
+        db.query(Rec.employee_id, Rec.date, Rec.check_in_time, Rec.check_out_time, Rec.status)
+        .filter(Rec.date >= start, Rec.date <= end)
+        .yield_per(_CHUNK),
+        archive.month_rows(year, month),
+    )
+    monthly = {}
+    daily = []
+    for row in rows:
+        m = monthly.setdefault(row.employee_id, {
+            "employee_id": row.employee_id, "year": year, "month": month,
+            "present_days": 0, "late_days": 0, "absent_days": 0, "worked_seconds": 0,
+        })
+        if row.status == "ABSENT":
+            m["absent_days"] += 1
+        if row.check_in_time is None or row.check_out_time is None:
+            continue
+        seconds = worked_seconds(row.check_in_time, row.check_out_time)
+        daily.append({"employee_id": row.employee_id, "date": row.date, "worked_seconds": seconds})
+        m["present_days"] += 1
+        m["late_days"] += int(is_late(row.check_in_time))
+        m["worked_seconds"] += seconds
+        if len(daily) >= _CHUNK:
+            db.execute(Daily.__table__.insert(), daily)
+            daily = []
+    if daily:
+        db.execute(Daily.__table__.insert(), daily)
+    monthly_rows = list(monthly.values())
+    for i in range(0, len(monthly_rows), _CHUNK):
+        db.execute(Monthly.__table__.insert(), monthly_rows[i:i + _CHUNK])
+
+
+def backfill(db, start: date, end: date):
+    """Rebuild every month overlapping [start, end], committing after each month."""
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        refresh_month(db, year, month)
+        db.commit()
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
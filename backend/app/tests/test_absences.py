@@ -0,0 +1,55 @@
+# app/tests/test_absences.py
+from datetime import date, datetime
+
+from app import holiday_calendar, models
+from app.absences import fill_absences
+
+
+def test_fill_absences(client, admin_token, create_employee, db_session):
+    a = create_employee(email="absent-a@example.com", password="p", first="Absent", last="A")
+    b = create_employee(email="absent-b@example.com", password="p", first="Absent", last="B")
+    late_joiner = create_employee(email="absent-new@example.com", password="p", first="Absent", last="New")
+    # February 2023: Mon 6th is a holiday, b is on approved leave 7-8th, a punched on the 9th
+    for emp_id, joined in ((a["id"], datetime(2022, 1, 1)), (b["id"], datetime(2022, 1, 1)), (late_joiner["id"], datetime(2023, 2, 20))):
+        db_session.get(models.Employee, emp_id).created_at = joined
+    db_session.add(models.Holiday(name="Absence test holiday", date=date(2023, 2, 6)))
+    db_session.add_all([
+        models.LeaveRequest(employee_id=b["id"], leave_type_id=1, start_date=date(2023, 2, 7), end_date=date(2023, 2, 8),
+                            status=models.LeaveStatus.approved),
+        models.LeaveRequest(employee_id=a["id"], leave_type_id=1, start_date=date(2023, 2, 10), end_date=date(2023, 2, 10),
+                            status=models.LeaveStatus.pending),
+        models.AttendanceRecord(employee_id=a["id"], date=date(2023, 2, 9), status="PRESENT",
+                                check_in_time=datetime(2023, 2, 9, 9), check_out_time=datetime(2023, 2, 9, 17)),
+    ])
+    db_session.commit()
+    holiday_calendar.invalidate()
+
+    first = fill_absences(db_session, date(2023, 2, 1), date(2023, 2, 28))
+    assert first["days"] == 20
+    # a: 20 weekdays minus the punched day; b: 20; late joiner: 20th-28th = 7 weekdays
+    assert first["inserted"] == 19 + 20 + 7
+    assert fill_absences(db_session, date(2023, 2, 1), date(2023, 2, 28))["inserted"] == 0
+
+    Rec = models.AttendanceRecord
+    def statuses(emp_id):
+        rows = db_session.query(Rec.date, Rec.status).filter(Rec.employee_id == emp_id, Rec.date.between(date(2023, 2, 1), date(2023, 2, 28)))
+        return {row.date.day: row.status for row in rows}
+
+    sa, sb = statuses(a["id"]), statuses(b["id"])
+    assert sa[6] == sb[6] == "HOLIDAY"
+    assert sb[7] == sb[8] == "ON_LEAVE"
+    assert sa[9] == "PRESENT"  # existing row kept
+    assert sa[10] == "ABSENT"  # pending leave doesn't count
+    assert 4 not in sa and 5 not in sa  # weekend
+    assert min(statuses(late_joiner["id"])) == 20
+
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    monthly = client.get(f"/reports/monthly?year=2023&month=2&employee_id={a['id']}", headers=headers).json()["items"][0]
+    assert monthly["present_days"] == 1
+    assert monthly["absent_days"] == 18  # 20 weekdays minus the holiday and the punched day
+    holiday_calendar.invalidate()
+
+
+def test_never_marks_today(db_session):
+    today = date.today()
+    assert fill_absences(db_session, today, today) == {"days": 0, "departments": 0, "inserted": 0}
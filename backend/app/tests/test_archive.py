@@ -0,0 +1,68 @@
+# app/tests/test_archive.py
+import csv
+import io
+from datetime import date, datetime
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from app import archive, models
+from app.config import settings
+from app.summaries import refresh_month
+
+
+def test_archive_month_and_read_back(client, admin_token, create_employee, db_session, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "ARCHIVE_DIR", str(tmp_path))
+    emp = create_employee(email="archived@example.com", password="p", first="Arch", last="Ived")
+    Rec = models.AttendanceRecord
+    db_session.add_all([
+        Rec(employee_id=emp["id"], date=date(2019, 3, day), status="PRESENT",
+            check_in_time=datetime(2019, 3, day, 8 + day % 3), check_out_time=datetime(2019, 3, day, 17))
+        for day in (4, 5, 6)
+    ] + [Rec(employee_id=emp["id"], date=date(2019, 4, 1), status="PRESENT", check_in_time=datetime(2019, 4, 1, 9))])
+    db_session.commit()
+
+    assert archive.archive_month(db_session, 2019, 3) == 3
+    assert archive.archive_month(db_session, 2019, 3) == 0
+    assert archive.archived_months() == [(2019, 3)]
+    assert archive.cutoff() == date(2019, 4, 1)
+    assert db_session.query(Rec).filter(Rec.employee_id == emp["id"]).count() == 1
+
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    base = f"/attendance/list?employee_id={emp['id']}&start_date=2019-03-01&end_date=2019-04-30"
+    resp = client.get(base, headers=headers).json()
+    assert resp["total"] == 4
+    assert [r["date"] for r in resp["items"]] == ["2019-04-01", "2019-03-06", "2019-03-05", "2019-03-04"]
+    assert resp["items"][1]["check_out_time"].startswith("2019-03-06T17:00:00")
+
+    # without start_date only the table is read
+    assert client.get(f"/attendance/list?employee_id={emp['id']}", headers=headers).json()["total"] == 1
+
+    page1 = client.get(base + "&limit=2", headers=headers).json()
+    page2 = client.get(base + f"&limit=2&cursor={page1['next_cursor']}", headers=headers).json()
+    assert [r["date"] for r in page2["items"]] == ["2019-03-05", "2019-03-04"]
+    assert page2["next_cursor"] is None
+    back = client.get(base + f"&limit=2&cursor={page2['prev_cursor']}", headers=headers).json()
+    assert [r["id"] for r in back["items"]] == [r["id"] for r in page1["items"]]
+    assert [r["date"] for r in client.get(base + "&skip=1&limit=2", headers=headers).json()["items"]] == ["2019-03-06", "2019-03-05"]
+
+    by_check_in = client.get(base + "&sort_by=check_in_time&order=asc", headers=headers).json()["items"]
+    assert [r["date"] for r in by_check_in] == ["2019-03-04", "2019-03-05", "2019-03-06", "2019-04-01"]
+
+    export = client.get(f"/attendance/export?employee_id={emp['id']}&start_date=2019-03-01&sort_by=date&order=asc", headers=headers)
+    rows = list(csv.DictReader(io.StringIO(export.text)))
+    assert [r["date"] for r in rows] == ["2019-03-04", "2019-03-05", "2019-03-06", "2019-04-01"]
+
+    # a row that reaches the table after its month was archived is appended on the next run
+    db_session.add(Rec(employee_id=emp["id"], date=date(2019, 3, 7), status="PRESENT",
+                       check_in_time=datetime(2019, 3, 7, 9), check_out_time=datetime(2019, 3, 7, 17)))
+    db_session.commit()
+    assert archive.archive_month(db_session, 2019, 3) == 1
+    assert len(archive.month_rows(2019, 3)) == 4
+
+    # summaries of an archived month are rebuilt from the file
+    refresh_month(db_session, 2019, 3)
+    db_session.commit()
+    monthly = db_session.query(models.AttendanceMonthlySummary).filter_by(employee_id=emp["id"], year=2019, month=3).one()
+    assert monthly.present_days == 4
@@ -1,4 +1,6 @@
 # app/tests/test_attendance.py
+import json
+
 import pytest
 
 def get_token_for(client, email, password):
@@ -27,3 +29,109 @@ def test_check_in_and_out(client, create_employee):
     assert r2.status_code == 200
     j2 = r2.json()
     assert j2.get("check_out_time") is not None
+
+def test_bulk_punch(client, admin_token, create_employee):
+    a = create_employee(email="bulka@example.com", password="p", first="BulkA", last="User")
+    b = create_employee(email="bulkb@example.com", password="p", first="BulkB", last="User")
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    events = [
+        {"employee_id": a["id"], "timestamp": "2026-03-02T17:30:00", "direction": "out"},
+        {"employee_id": a["id"], "timestamp": "2026-03-02T09:00:00", "direction": "in"},
+        {"employee_id": b["id"], "timestamp": "2026-03-02T18:00:00", "direction": "out"},
+        {"employee_id": 999999, "timestamp": "2026-03-02T09:00:00", "direction": "in"},
+    ]
+    r = client.post("/attendance/bulk", headers=headers, json={"events": events})
+    assert r.status_code == 200
+    d = r.json()
+    statuses = [res["status"] for res in d["results"]]
+    # events are folded in timestamp order, so a's check-out lands after its check-in
+    assert statuses == ["applied", "applied", "rejected", "rejected"]
+    assert d["applied"] == 2 and d["rejected"] == 2
+
+    # replaying the same batch is idempotent
+    r2 = client.post("/attendance/bulk", headers=headers, json={"events": events[:2]})
+    assert [res["status"] for res in r2.json()["results"]] == ["duplicate", "duplicate"]
+
+    lst = client.get(f"/attendance/list?employee_id={a['id']}", headers=headers).json()
+    assert lst["total"] == 1
+    assert lst["items"][0]["check_in_time"].startswith("2026-03-02T09:00")
+    assert lst["items"][0]["check_out_time"].startswith("2026-03-02T17:30")
+
+def test_bulk_punch_files_offset_timestamps_by_utc_date(client, admin_token, create_employee):
+    emp = create_employee(email="bulktz@example.com", password="p", first="BulkTz", last="User")
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    events = [{"employee_id": emp["id"], "timestamp": "2026-03-10T01:00:00+05:30", "direction": "in"}]
+    r = client.post("/attendance/bulk", headers=headers, json={"events": events})
+    assert r.json()["results"][0]["date"] == "2026-03-09"
+    item = client.get(f"/attendance/list?employee_id={emp['id']}", headers=headers).json()["items"][0]
+    assert item["date"] == "2026-03-09"
+    assert item["check_in_time"].startswith("2026-03-09T19:30")
+
+def test_bulk_punch_requires_admin(client, create_employee):
+    emp = create_employee(email="bulkc@example.com", password="p", first="BulkC", last="User")
+    token = get_token_for(client, emp["email"], emp["password"])
+    r = client.post("/attendance/bulk", headers={"Authorization": f"Bearer {token}"}, json={"events": []})
+    assert r.status_code == 403
+
+def test_export_streams_filtered_rows(client, admin_token, create_employee):
+    emp = create_employee(email="export@example.com", password="p", first="Export", last="User")
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    events = [
+        {"employee_id": emp["id"], "timestamp": f"2026-04-0{d}T09:00:00", "direction": "in"}
+        for d in (1, 2, 3)
+    ]
+    assert client.post("/attendance/bulk", headers=headers, json={"events": events}).status_code == 200
+
+    url = f"/attendance/export?employee_id={emp['id']}&start_date=2026-04-02&order=asc&sort_by=date"
+    r = client.get(url + "&format=csv", headers=headers)
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/csv")
+    lines = r.text.strip().splitlines()
+    assert lines[0] == "id,employee_id,date,check_in_time,check_out_time,status"
+    assert [l.split(",")[2] for l in lines[1:]] == ["2026-04-02", "2026-04-03"]
+
+    r = client.get(url + "&format=ndjson", headers=headers)
+    rows = [json.loads(l) for l in r.text.splitlines()]
+    assert [row["date"] for row in rows] == ["2026-04-02", "2026-04-03"]
+    assert rows[0]["check_out_time"] is None
+
+    # employees only ever export their own rows
+    token = get_token_for(client, emp["email"], emp["password"])
+    r = client.get("/attendance/export?format=ndjson", headers={"Authorization": f"Bearer {token}"})
+    assert {json.loads(l)["employee_id"] for l in r.text.splitlines()} == {emp["id"]}
+
+    assert client.get("/attendance/export?format=xml", headers=headers).status_code == 400
+
+def test_concurrent_check_ins_one_wins(client, create_employee):
+    import asyncio
+    import httpx
+    from app.main import app
+
+    emp = create_employee(email="racer@example.com", password="p", first="Race", last="Badge")
+    headers = {"Authorization": f"Bearer {get_token_for(client, emp['email'], 'p')}"}
+
+    async def punch_all():
+        async with httpx.AsyncClient(app=app, base_url="http://test") as ac:
+            return await asyncio.gather(*(ac.post("/attendance/check-in", headers=headers) for _ in range(8)))
+
+    statuses = sorted(r.status_code for r in asyncio.run(punch_all()))
+    # previously the losers of the read-then-insert race hit _emp_date_uc and got 500
+    assert statuses == [200] + [400] * 7
+
+def test_check_in_fills_row_without_check_in(client, create_employee, db_session):
+    from datetime import date
+    import app.models as models
+
+    emp = create_employee(email="absentfirst@example.com", password="p", first="Absent", last="First")
+    headers = {"Authorization": f"Bearer {get_token_for(client, emp['email'], 'p')}"}
+    assert client.post("/attendance/check-out", headers=headers).json()["detail"] == "No check-in record found for today"
+    # e.g. written by the absence job before the employee turned up
+    db_session.add(models.AttendanceRecord(employee_id=emp["id"], date=date.today(), status="ABSENT"))
+    db_session.commit()
+
+    r = client.post("/attendance/check-in", headers=headers)
+    assert r.status_code == 200
+    assert r.json()["status"] == "PRESENT"
+    assert r.json()["check_in_time"] is not None
+    assert client.post("/attendance/check-out", headers=headers).status_code == 200
+    assert client.post("/attendance/check-out", headers=headers).json()["detail"] == "Already checked out"
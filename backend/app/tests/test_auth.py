@@ -12,3 +12,77 @@ def test_login_fail(client):
         "password": "bad"
     })
     assert resp.status_code == 400
+
+def test_role_change_invalidates_cached_principal(client, create_employee, db_session):
+    import app.models as models
+    emp = create_employee(email="promoted@example.com", password="promopass", first="Promo", last="User")
+    resp = client.post("/auth/login", data={"username": emp["email"], "password": emp["password"]})
+    headers = {"Authorization": f"Bearer {resp.json()['access_token']}"}
+    payload = {"name": "Promotion Day", "date": "2026-12-24"}
+
+    # principal is now cached as a plain employee
+    assert client.post("/holidays/create", headers=headers, json=payload).status_code == 403
+
+    row = db_session.query(models.Employee).filter_by(id=emp["id"]).first()
+    row.role = models.RoleEnum.admin
+    db_session.commit()
+
+    assert client.post("/holidays/create", headers=headers, json=payload).status_code == 200
+
+def test_principal_recached_between_flush_and_commit(client, create_employee, db_session):
+    import app.models as models
+    emp = create_employee(email="flushpromo@example.com", password="p", first="Flush", last="Promo")
+    resp = client.post("/auth/login", data={"username": emp["email"], "password": emp["password"]})
+    headers = {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+    row = db_session.query(models.Employee).filter_by(id=emp["id"]).first()
+    row.role = models.RoleEnum.admin
+    db_session.flush()
+    # a request between flush and commit still sees (and caches) the old role
+    assert client.get("/metrics/password-pool", headers=headers).status_code == 403
+    db_session.commit()
+    assert client.get("/metrics/password-pool", headers=headers).status_code == 200
+
+def test_password_pool_metrics(client, admin_token):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    resp = client.get("/metrics/password-pool", headers=headers)
+    assert resp.status_code == 200
+    stats = resp.json()
+    # the admin login above went through the pool
+    assert stats["completed"] >= 1
+    assert stats["queued"] == 0 and stats["running"] == 0
+
+def test_db_pool_metrics(client, admin_token):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    resp = client.get("/metrics/db-pool", headers=headers)
+    assert resp.status_code == 200
+    sync = resp.json()["sync"]
+    assert sync["checkouts"] >= 1
+    assert sync["timeouts"] == 0
+
+def test_pool_counts_only_checkouts_that_open_overflow(tmp_path):
+    from sqlalchemy import create_engine
+    from sqlalchemy.pool import QueuePool
+    from app.pool_metrics import PoolMetrics, instrument_engine, instrumented_pool
+
+    metrics = PoolMetrics()
+    eng = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=instrumented_pool(QueuePool, metrics), pool_size=1, max_overflow=2,
+    )
+    instrument_engine(eng, metrics)
+    first, second = eng.connect(), eng.connect()  # second one is overflow
+    second.close()
+    first.close()
+    # pool connection is back: later checkouts reuse it even while nothing else is open
+    for _ in range(3):
+        eng.connect().close()
+    held = eng.connect()
+    extra = eng.connect()  # overflow again
+    third = eng.connect()  # and again
+    for c in (third, extra, held):
+        c.close()
+    stats = metrics.snapshot()
+    assert stats["checkouts"] == 8
+    assert stats["overflow_checkouts"] == 3
+    eng.dispose()
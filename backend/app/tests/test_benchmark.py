@@ -0,0 +1,33 @@
+# app/tests/test_benchmark.py
+import json
+import os
+import subprocess
+import sys
+
+from benchmark import percentile, summarize
+
+BACKEND = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+
+
+def test_summary_percentiles():
+    latencies = [i / 1000 for i in range(1, 101)]  # 1..100 ms
+    s = summarize(latencies, {200: 99, 500: 1}, elapsed=2.0)
+    assert (s["p50_ms"], s["p95_ms"], s["p99_ms"], s["max_ms"]) == (50.0, 95.0, 99.0, 100.0)
+    assert s["rps"] == 50.0 and s["errors"] == 1
+    assert percentile([], 50) == 0.0
+
+
+def test_benchmark_run_reports_json(tmp_path):
+    out = tmp_path / "bench.json"
+    env = {**os.environ, "ASYNC_DB": "false"}
+    subprocess.run(
+        [sys.executable, "benchmark.py", "--database-url", f"sqlite:///{tmp_path / 'bench.db'}",
+         "--employees", "8", "--days", "5", "--requests", "8", "--concurrency", "2",
+         "--scenarios", "check_in,list,search,approve", "--output", str(out)],
+        cwd=BACKEND, env=env, check=True, timeout=120,
+    )
+    report = json.loads(out.read_text())
+    assert set(report["scenarios"]) == {"check_in", "list", "search", "approve"}
+    for name, result in report["scenarios"].items():
+        assert result["requests"] == 8 and result["errors"] == 0, name
+        assert result["p50_ms"] <= result["p99_ms"]
@@ -0,0 +1,73 @@
+# app/tests/test_dashboard.py
+from datetime import date, datetime
+
+from app import dashboard, models
+
+
+def _member(db_session, create_employee, department_id, email, role=models.RoleEnum.employee):
+    emp = create_employee(email=email, password="p", first=email.split("@")[0], last="Dash")
+    row = db_session.get(models.Employee, emp["id"])
+    row.department_id = department_id
+    row.role = role
+    row.created_at = datetime(2027, 1, 1)
+    db_session.commit()
+    return emp
+
+
+def test_department_dashboard(client, admin_token, create_employee, db_session):
+    dashboard.invalidate()
+    dept = models.Department(name="Dashboard")
+    db_session.add(dept)
+    db_session.commit()
+    early = _member(db_session, create_employee, dept.id, "dash-early@example.com")
+    late = _member(db_session, create_employee, dept.id, "dash-late@example.com")
+    away = _member(db_session, create_employee, dept.id, "dash-leave@example.com")
+    _member(db_session, create_employee, dept.id, "dash-missing@example.com")
+    manager = _member(db_session, create_employee, dept.id, "dash-manager@example.com", models.RoleEnum.manager)
+    gone = _member(db_session, create_employee, dept.id, "dash-inactive@example.com")
+    db_session.get(models.Employee, gone["id"]).is_active = False
+
+    # week of Mon 2027-09-13; Tue 14th is a holiday, "today" is Wed 15th
+    Rec = models.AttendanceRecord
+    db_session.add_all([
+        models.Holiday(name="Dashboard holiday", date=date(2027, 9, 14)),
+        Rec(employee_id=early["id"], date=date(2027, 9, 13), check_in_time=datetime(2027, 9, 13, 8), status="PRESENT"),
+        Rec(employee_id=early["id"], date=date(2027, 9, 15), check_in_time=datetime(2027, 9, 15, 9), status="PRESENT"),
+        Rec(employee_id=late["id"], date=date(2027, 9, 15), check_in_time=datetime(2027, 9, 15, 10), status="PRESENT"),
+        Rec(employee_id=gone["id"], date=date(2027, 9, 15), check_in_time=datetime(2027, 9, 15, 8), status="PRESENT"),
+        models.LeaveRequest(employee_id=away["id"], leave_type_id=1, start_date=date(2027, 9, 13),
+                            end_date=date(2027, 9, 17), status=models.LeaveStatus.approved),
+    ])
+    db_session.commit()
+
+    week = dashboard.department_summary(db_session, dept.id, dashboard.WEEK, today=date(2027, 9, 15))
+    assert (week["start_date"], week["end_date"]) == (date(2027, 9, 13), date(2027, 9, 15))
+    assert week["members_total"] == 5
+    assert (week["present"], week["late"], week["on_leave"], week["absent"]) == (3, 1, 2, 5)
+    by_id = {m["id"]: m for m in week["members"]}
+    assert (by_id[early["id"]]["present_days"], by_id[early["id"]]["absent_days"]) == (2, 0)
+    assert (by_id[late["id"]]["late_days"], by_id[late["id"]]["absent_days"]) == (1, 1)
+    assert by_id[away["id"]]["on_leave_days"] == 2
+    assert {m["status"] for m in week["members"]} == {"present", "late", "on_leave", "absent"}
+
+    today = dashboard.department_summary(db_session, dept.id, dashboard.TODAY, today=date(2027, 9, 15))
+    assert (today["present"], today["late"], today["on_leave"], today["absent"]) == (2, 1, 1, 2)
+    holiday = dashboard.department_summary(db_session, dept.id, dashboard.TODAY, today=date(2027, 9, 14))
+    assert holiday["absent"] == 0 and {m["status"] for m in holiday["members"]} == {"holiday"}
+
+    # endpoint: managers see their own department, admins any
+    token = client.post("/auth/login", data={"username": manager["email"], "password": "p"}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    resp = client.get("/reports/department?period=week", headers=headers)
+    assert resp.status_code == 200
+    assert resp.json()["members_total"] == 5
+    general = db_session.query(models.Department).filter_by(name="General").one()
+    assert client.get(f"/reports/department?department_id={general.id}", headers=headers).status_code == 403
+    assert client.get("/reports/department?period=month", headers=headers).status_code == 400
+
+    admin = {"Authorization": f"Bearer {admin_token}"}
+    assert client.get(f"/reports/department?department_id={dept.id}", headers=admin).json()["members_total"] == 5
+    assert client.get("/reports/department?department_id=99999", headers=admin).status_code == 404
+    token = client.post("/auth/login", data={"username": early["email"], "password": "p"}).json()["access_token"]
+    assert client.get("/reports/department", headers={"Authorization": f"Bearer {token}"}).status_code == 403
+    dashboard.invalidate()
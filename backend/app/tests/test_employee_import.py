@@ -0,0 +1,58 @@
+# app/tests/test_employee_import.py
+import json
+
+from app import models
+
+CSV = """first_name,last_name,email,password,department_id,role
+Imp,One,import-one@example.com,pw-one,1,employee
+Imp,Taken,admin@example.com,pw,1,employee
+Imp,Bad,not-an-email,pw,1,employee
+Imp,Again,import-one@example.com,pw,1,employee
+Imp,Nowhere,import-nowhere@example.com,pw,99999,employee
+Imp,Two,import-two@example.com,pw-two,,manager
+"""
+
+
+def test_import_csv(client, admin_token, db_session):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    files = {"file": ("staff.csv", CSV, "text/csv")}
+
+    dry = client.post("/employees/import?dry_run=true", headers=headers, files=files).json()
+    assert (dry["created"], dry["failed"]) == (0, 4)
+    assert db_session.query(models.Employee).filter_by(email="import-one@example.com").first() is None
+
+    resp = client.post("/employees/import", headers=headers, files=files)
+    assert resp.status_code == 200
+    report = resp.json()
+    assert (report["created"], report["failed"]) == (2, 4)
+    by_line = {r["line"]: r for r in report["results"]}
+    assert by_line[2]["status"] == "created" and by_line[2]["id"]
+    assert by_line[3]["detail"] == "Email already registered"
+    assert by_line[4]["detail"].startswith("email:")
+    assert by_line[5]["detail"] == "email repeats line 2"
+    assert by_line[6]["detail"] == "unknown department_id 99999"
+    two = db_session.get(models.Employee, by_line[7]["id"])
+    assert (two.role, two.department_id) == (models.RoleEnum.manager, None)
+
+    login = client.post("/auth/login", data={"username": "import-one@example.com", "password": "pw-one"})
+    assert login.status_code == 200
+
+    # a second run only reports conflicts
+    again = client.post("/employees/import", headers=headers, files=files).json()
+    assert again["created"] == 0
+
+
+def test_import_ndjson(client, admin_token):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    body = "\n".join([
+        json.dumps({"first_name": "Nd", "email": "import-nd@example.com", "password": "pw"}),
+        "{not json",
+        "",
+        json.dumps({"first_name": "Nd", "email": "import-nd2@example.com"}),
+    ])
+    report = client.post("/employees/import?format=ndjson", headers=headers, files={"file": ("staff.txt", body)}).json()
+    assert report["created"] == 1
+    assert [(r["line"], r["status"]) for r in report["results"]] == [(1, "created"), (2, "failed"), (4, "failed")]
+    assert report["results"][2]["detail"] == "password: field required"
+
+    assert client.post("/employees/import", headers=headers, files={"file": ("staff.txt", body)}).status_code == 400
@@ -0,0 +1,47 @@
+# app/tests/test_fast_json.py
+from datetime import date, datetime, timedelta
+
+from app import models
+from app.config import settings
+
+
+def _both(client, monkeypatch, url, headers):
+    monkeypatch.setattr(settings, "FAST_LIST_RESPONSES", False)
+    slow = client.get(url, headers=headers)
+    monkeypatch.setattr(settings, "FAST_LIST_RESPONSES", True)
+    fast = client.get(url, headers=headers)
+    assert slow.status_code == fast.status_code == 200
+    return slow, fast
+
+
+def test_fast_lists_match_schema_serialization(client, admin_token, create_employee, db_session, monkeypatch):
+    emp = create_employee(email="fastjson@example.com", password="p", first="Fäst", last="Jsön")
+    day = date(2024, 3, 4)
+    db_session.add_all([
+        # microseconds, a missing check-out and non-ASCII names exercise the encoders
+        models.AttendanceRecord(employee_id=emp["id"], date=day, status="PRESENT",
+                                check_in_time=datetime(2024, 3, 4, 9, 0, 0, 123456),
+                                check_out_time=datetime(2024, 3, 4, 17, 30)),
+        models.AttendanceRecord(employee_id=emp["id"], date=day + timedelta(days=1), status="PRESENT",
+                                check_in_time=datetime(2024, 3, 5, 8, 59, 59)),
+    ])
+    db_session.commit()
+    headers = {"Authorization": f"Bearer {admin_token}"}
+
+    urls = [
+        f"/attendance/list?employee_id={emp['id']}",
+        f"/attendance/list?employee_id={emp['id']}&sort_by=check_out_time&order=asc&limit=1",
+        "/employees/list?limit=500",
+        "/employees/list?q=fäst&sort_by=email&order=desc",
+        "/employees/list?q=jsön&search_mode=ranked",
+    ]
+    for url in urls:
+        slow, fast = _both(client, monkeypatch, url, headers)
+        assert fast.content == slow.content, url
+        assert fast.headers["content-type"] == slow.headers["content-type"]
+
+    # cursors from one mode work in the other
+    page = client.get(f"/attendance/list?employee_id={emp['id']}&limit=1", headers=headers).json()
+    slow, fast = _both(client, monkeypatch, f"/attendance/list?employee_id={emp['id']}&limit=1&cursor={page['next_cursor']}", headers)
+    assert fast.content == slow.content
+    assert fast.json()["items"][0]["date"] == "2024-03-04"
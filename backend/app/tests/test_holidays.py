@@ -0,0 +1,48 @@
+# app/tests/test_holidays.py
+from datetime import date
+
+from app.holiday_calendar import HolidayCalendar, weekdays_between
+
+
+def test_calendar_arithmetic():
+    cal = HolidayCalendar([
+        {"id": 1, "name": "Weekday", "date": date(2031, 3, 5), "description": None},   # Wednesday
+        {"id": 2, "name": "Weekend", "date": date(2031, 3, 8), "description": None},   # Saturday
+    ])
+    assert cal.is_holiday(date(2031, 3, 5)) and cal.is_holiday(date(2031, 3, 8))
+    assert not cal.is_holiday(date(2031, 3, 6)) and not cal.is_holiday(date(2030, 3, 5))
+    # Mon 3 .. Sun 16 March 2031: two full weeks
+    assert weekdays_between(date(2031, 3, 3), date(2031, 3, 16)) == 10
+    assert cal.working_days(date(2031, 3, 3), date(2031, 3, 16)) == 9
+    assert cal.working_days(date(2031, 3, 8), date(2031, 3, 9)) == 0
+    assert cal.working_days(date(2031, 3, 9), date(2031, 3, 8)) == 0
+    # brute force over a range crossing a year boundary
+    start, end = date(2030, 12, 20), date(2031, 3, 10)
+    expected = sum(
+        1 for o in range(start.toordinal(), end.toordinal() + 1)
+        if date.fromordinal(o).weekday() < 5 and not cal.is_holiday(date.fromordinal(o))
+    )
+    assert cal.working_days(start, end) == expected
+
+
+def test_list_conditional_requests(client, admin_token):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    payload = {"name": "Calendar Day", "date": "2031-03-05"}
+    assert client.post("/holidays/create", headers=headers, json=payload).status_code == 200
+
+    r = client.get("/holidays/list")
+    assert r.status_code == 200
+    assert any(h["name"] == "Calendar Day" for h in r.json())
+    etag = r.headers["etag"]
+    assert client.get("/holidays/list", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/holidays/list", headers={"If-Modified-Since": r.headers["last-modified"]}).status_code == 304
+
+    # creating a holiday invalidates the calendar
+    payload = {"name": "Calendar Day 2", "date": "2031-03-06"}
+    assert client.post("/holidays/create", headers=headers, json=payload).status_code == 200
+    r2 = client.get("/holidays/list", headers={"If-None-Match": etag})
+    assert r2.status_code == 200
+    assert r2.headers["etag"] != etag
+
+    r = client.get("/holidays/working-days?start_date=2031-03-03&end_date=2031-03-09")
+    assert r.json() == {"start_date": "2031-03-03", "end_date": "2031-03-09", "working_days": 3, "holidays": 2}
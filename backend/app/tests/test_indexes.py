@@ -0,0 +1,165 @@
+# app/tests/test_indexes.py
+import re
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app import holiday_calendar
+from app.config import settings
+from app.database import engine
+import app.models as models
+
+# statements are captured from (and explained on) the sync engine
+pytestmark = pytest.mark.skipif(settings.ASYNC_DB, reason="list endpoints run on the async engine")
+
+# large enough that a seq scan + sort is clearly the worse plan
+N_EMPLOYEES = 50
+N_DAYS = 400
+
+
+@contextmanager
+def captured_selects():
+    """Collect (statement, parameters) of every SELECT sent to the DB inside the block."""
+    seen = []
+
+    def before(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            seen.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before)
+    try:
+        yield seen
+    finally:
+        event.remove(engine, "before_cursor_execute", before)
+
+
+def explain(statement, parameters):
+    with engine.connect() as conn:
+        if engine.dialect.name == "sqlite":
+            rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).fetchall()
+            return "\n".join(r[-1] for r in rows)
+        rows = conn.exec_driver_sql("EXPLAIN " + statement, parameters).fetchall()
+        return "\n".join(r[0] for r in rows)
+
+
+def full_scans(plan, table):
+    """Plan lines reading `table` without any index."""
+    if engine.dialect.name == "sqlite":
+        return [l for l in plan.splitlines() if re.search(rf"\bSCAN {table}\b(?! USING)", l)]
+    return [l for l in plan.splitlines() if f"Seq Scan on {table}" in l]
+
+
+def sorts(plan):
+    """Plan lines where rows are sorted instead of read in index order."""
+    if engine.dialect.name == "sqlite":
+        return [l for l in plan.splitlines() if "TEMP B-TREE FOR ORDER BY" in l]
+    return [l for l in plan.splitlines() if re.match(r"\s*(->\s*)?(Incremental )?Sort\b", l)]
+
+
+@pytest.fixture(scope="module")
+def large_dataset(client):
+    db = engine.connect()
+    dept_id = db.exec_driver_sql("SELECT id FROM departments WHERE name = 'General'").scalar()
+    emp_ids = []
+    for i in range(N_EMPLOYEES):
+        res = db.execute(models.Employee.__table__.insert().values(
+            first_name=f"Seed{i}", last_name=f"Explain{i:03d}", email=f"explainseed{i}@example.com",
+            password_hash="x", role=models.RoleEnum.employee, department_id=dept_id,
+        ))
+        emp_ids.append(res.inserted_primary_key[0])
+
+    start = date(2025, 1, 1)
+    db.execute(models.AttendanceRecord.__table__.insert(), [
+        {
+            "employee_id": emp_id, "date": start + timedelta(days=d), "status": "PRESENT",
+            # some open days so the nullable sort columns hold NULLs
+            "check_in_time": datetime(2025, 1, 1, 9) + timedelta(days=d, minutes=emp_id % 60),
+            "check_out_time": None if d % 10 == 0 else datetime(2025, 1, 1, 17) + timedelta(days=d),
+        }
+        for emp_id in emp_ids for d in range(N_DAYS)
+    ])
+    db.execute(models.LeaveRequest.__table__.insert(), [
+        {
+            "employee_id": emp_id, "leave_type_id": 1, "start_date": start + timedelta(days=d),
+            "end_date": start + timedelta(days=d), "status": models.LeaveStatus.pending,
+            "applied_at": datetime(2025, 1, 1) + timedelta(days=d, seconds=emp_id),
+        }
+        for emp_id in emp_ids for d in range(0, N_DAYS, 5)
+    ])
+    db.execute(models.Holiday.__table__.insert(), [
+        {"name": f"Seed holiday {d}", "date": start + timedelta(days=d)} for d in range(0, N_DAYS * 2, 3)
+    ])
+    db.exec_driver_sql("ANALYZE")
+    if hasattr(db, "commit"):
+        db.commit()
+    holiday_calendar.invalidate()
+    yield emp_ids
+
+    # shared session database: leave nothing behind for later modules
+    for table in (models.AttendanceRecord, models.LeaveRequest):
+        db.execute(table.__table__.delete().where(table.employee_id.in_(emp_ids)))
+    db.execute(models.Holiday.__table__.delete().where(models.Holiday.name.like("Seed holiday %")))
+    db.execute(models.Employee.__table__.delete().where(models.Employee.id.in_(emp_ids)))
+    if hasattr(db, "commit"):
+        db.commit()
+    db.close()
+    holiday_calendar.invalidate()
+
+
+def _login(client, email, password):
+    resp = client.post("/auth/login", data={"username": email, "password": password})
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+
+def test_list_endpoints_use_indexes(client, admin_token, create_employee, large_dataset):
+    admin = {"Authorization": f"Bearer {admin_token}"}
+    emp_id = large_dataset[3]
+    emp = create_employee(email="explain@example.com", password="p", first="Explain", last="User")
+    emp_headers = _login(client, emp["email"], emp["password"])
+
+    # (url, headers, table that must be read through an index, page must come in index order)
+    shapes = [
+        (f"/attendance/list?employee_id={emp_id}", admin, "attendance_records", True),
+        (f"/attendance/list?employee_id={emp_id}&start_date=2025-02-01&end_date=2025-02-28", admin, "attendance_records", True),
+        (f"/attendance/list?employee_id={emp_id}&sort_by=check_in_time&order=asc", admin, "attendance_records", True),
+        (f"/attendance/list?employee_id={emp_id}&sort_by=check_in_time&order=desc", admin, "attendance_records", True),
+        (f"/attendance/list?employee_id={emp_id}&sort_by=check_out_time&order=asc", admin, "attendance_records", True),
+        (f"/attendance/list?employee_id={emp_id}&sort_by=check_out_time&order=desc", admin, "attendance_records", True),
+        ("/attendance/list?start_date=2025-03-01&end_date=2025-03-03", admin, "attendance_records", False),
+        ("/attendance/list?limit=20&include_total=false", admin, "attendance_records", True),
+        ("/leave/list", emp_headers, "leave_requests", True),
+        ("/leave/list?limit=20&include_total=false", admin, "leave_requests", True),
+        ("/leave/list?status=PENDING&limit=20&include_total=false", admin, "leave_requests", True),
+        (f"/leave/list?employee_id={emp_id}&limit=20", admin, "leave_requests", True),
+        ("/employees/list?sort_by=last_name&order=asc&skip=20&limit=10", admin, "employees", True),
+        ("/employees/list?sort_by=created_at&order=desc&limit=10", admin, "employees", True),
+    ]
+    for url, headers, table, ordered in shapes:
+        with captured_selects() as seen:
+            assert client.get(url, headers=headers).status_code == 200
+        statements = [(s, p) for s, p in seen if re.search(rf"\bFROM {table}\b", s)]
+        assert statements, url
+        for statement, parameters in statements:
+            # an unfiltered employees count reads the whole (small) table by definition
+            if table == "employees" and "count(*)" in statement:
+                continue
+            plan = explain(statement, parameters)
+            assert not full_scans(plan, table), f"{url}: {statement}\n{plan}"
+            if ordered and "ORDER BY" in statement:
+                assert not sorts(plan), f"{url}: {statement}\n{plan}"
+
+
+def test_full_list_reads_follow_index_order(client, admin_token, large_dataset):
+    # the holiday calendar loads the whole table, so the index only has to save the sort
+    if engine.dialect.name != "sqlite":
+        pytest.skip("PostgreSQL may legitimately prefer seq scan + sort for full-table reads")
+    with captured_selects() as seen:
+        holiday_calendar.invalidate()
+        assert client.get("/holidays/list").status_code == 200
+    statements = [(s, p) for s, p in seen if re.search(r"\bFROM holidays\b", s)]
+    assert statements
+    for statement, parameters in statements:
+        plan = explain(statement, parameters)
+        assert not sorts(plan), f"{statement}\n{plan}"
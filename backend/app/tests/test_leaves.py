@@ -33,3 +33,129 @@ def test_apply_and_approve_leave(client, create_employee, admin_token):
     j2 = r2.json()
     assert "remaining_leaves" in j2
     assert j2["message"] == "Leave approved"
+
+def test_leave_cost_skips_weekends_and_holidays(client, create_employee, admin_token):
+    emp = create_employee(email="leavecost@example.com", password="p", first="Leave", last="Cost")
+    user_headers = {"Authorization": f"Bearer {get_token_for(client, emp['email'], emp['password'])}"}
+    admin_headers = {"Authorization": f"Bearer {admin_token}"}
+    # Wed 2032-06-02 is a holiday; Fri 28 May .. Fri 4 June spans a weekend
+    client.post("/holidays/create", headers=admin_headers, json={"name": "Cost Day", "date": "2032-06-02"})
+
+    r = client.post("/leave/preview-cost", headers=user_headers, json={"items": [
+        {"start_date": "2032-05-28", "end_date": "2032-06-04"},
+        {"start_date": "2032-05-29", "end_date": "2032-05-30"},
+    ]})
+    assert r.status_code == 200
+    items = r.json()["items"]
+    assert [(i["calendar_days"], i["working_days"]) for i in items] == [(8, 5), (2, 0)]
+
+    lr = client.post("/leave/apply", headers=user_headers, json={
+        "leave_type_id": 1, "start_date": "2032-05-28", "end_date": "2032-06-04",
+    }).json()
+    r2 = client.put(f"/leave/{lr['id']}/approve", headers=admin_headers)
+    assert r2.status_code == 200
+    assert r2.json()["remaining_leaves"] == 17 - 5
+
+def test_bulk_review(client, create_employee, admin_token):
+    emp = create_employee(email="bulkleave@example.com", password="p", first="Bulk", last="Leave")
+    user_headers = {"Authorization": f"Bearer {get_token_for(client, emp['email'], emp['password'])}"}
+    admin_headers = {"Authorization": f"Bearer {admin_token}"}
+
+    def apply(start, end):
+        return client.post("/leave/apply", headers=user_headers, json={
+            "leave_type_id": 1, "start_date": start, "end_date": end,
+        }).json()["id"]
+
+    # 2033: Mon 3 Jan .. Fri 14 Jan is 10 working days, then 5, then 5 more would exceed 17
+    a = apply("2033-01-03", "2033-01-14")
+    b = apply("2033-01-17", "2033-01-21")
+    c = apply("2033-01-24", "2033-01-28")
+    r = client.post("/leave/bulk-review", headers=user_headers, json={"leave_ids": [a], "action": "approve"})
+    assert r.status_code == 403
+
+    r = client.post("/leave/bulk-review", headers=admin_headers, json={"leave_ids": [c, a, b, 999999], "action": "approve"})
+    assert r.status_code == 200
+    d = r.json()
+    assert [x["leave_id"] for x in d["results"]] == [c, a, b, 999999]
+    assert [x["status"] for x in d["results"]] == ["failed", "approved", "approved", "failed"]
+    assert d["results"][2]["remaining_leaves"] == 2
+    assert d["succeeded"] == 2 and d["failed"] == 2
+
+    r = client.post("/leave/bulk-review", headers=admin_headers, json={"leave_ids": [a, c], "action": "reject"})
+    assert [x["status"] for x in r.json()["results"]] == ["failed", "rejected"]
+
+def test_leave_list_pagination_and_filters(client, create_employee, admin_token):
+    from sqlalchemy import event
+    from app.database import engine
+
+    emp = create_employee(email="leavelist@example.com", password="p", first="Leave", last="List")
+    user_headers = {"Authorization": f"Bearer {get_token_for(client, emp['email'], emp['password'])}"}
+    admin_headers = {"Authorization": f"Bearer {admin_token}"}
+    ids = [
+        client.post("/leave/apply", headers=user_headers, json={
+            "leave_type_id": 1 + i % 2, "start_date": f"2034-02-{i + 1:02d}", "end_date": f"2034-02-{i + 1:02d}",
+        }).json()["id"]
+        for i in range(5)
+    ]
+
+    base = f"/leave/list?employee_id={emp['id']}&limit=2"
+    seen = []
+    def count(*args):
+        seen.append(1)
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        page = client.get(base, headers=admin_headers).json()
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    assert page["total"] == 5
+    # leave type and employee are loaded with the page (auth + count + page)
+    assert len(seen) <= 3
+    collected = [i["id"] for i in page["items"]]
+    assert page["items"][0]["employee"]["email"] == emp["email"]
+    assert page["items"][0]["leave_type"]["id"] in (1, 2)
+    for _ in range(10):  # guard: a cursor that does not advance must fail, not hang
+        if not page["next_cursor"]:
+            break
+        page = client.get(base + f"&cursor={page['next_cursor']}", headers=admin_headers).json()
+        collected += [i["id"] for i in page["items"]]
+    assert page["next_cursor"] is None
+    assert collected == sorted(ids, reverse=True)
+
+    prev = client.get(base + f"&cursor={page['prev_cursor']}", headers=admin_headers).json()
+    assert [i["id"] for i in prev["items"]] == sorted(ids, reverse=True)[2:4]
+
+    r = client.get(f"/leave/list?employee_id={emp['id']}&leave_type_id=2&start_date=2034-02-02&end_date=2034-02-03&sort_by=start_date&order=asc", headers=admin_headers).json()
+    assert [i["start_date"] for i in r["items"]] == ["2034-02-02"]
+    r = client.get(f"/leave/list?employee_id={emp['id']}&status=APPROVED", headers=admin_headers).json()
+    assert r["total"] == 0
+
+    # employees never see other people's requests, whatever employee_id they pass
+    r = client.get("/leave/list?employee_id=1", headers=user_headers).json()
+    assert {i["employee_id"] for i in r["items"]} == {emp["id"]}
+
+def test_leave_list_cursor_with_equal_applied_at(client, create_employee, admin_token, db_session):
+    from datetime import datetime
+    import app.models as models
+
+    emp = create_employee(email="leavetie@example.com", password="p", first="Leave", last="Tie")
+    admin_headers = {"Authorization": f"Bearer {admin_token}"}
+    same = datetime(2034, 3, 1, 9, 0, 0)
+    rows = [
+        models.LeaveRequest(employee_id=emp["id"], leave_type_id=1, start_date=date(2034, 3, d), end_date=date(2034, 3, d), applied_at=same)
+        for d in range(1, 6)
+    ]
+    db_session.add_all(rows)
+    db_session.commit()
+    ids = [r.id for r in rows]
+
+    base = f"/leave/list?employee_id={emp['id']}&limit=2"
+    for order in ("desc", "asc"):
+        page = client.get(base + f"&order={order}", headers=admin_headers).json()
+        collected = [i["id"] for i in page["items"]]
+        for _ in range(10):
+            if not page["next_cursor"]:
+                break
+            page = client.get(base + f"&order={order}&cursor={page['next_cursor']}", headers=admin_headers).json()
+            collected += [i["id"] for i in page["items"]]
+        # ties on applied_at are broken by id
+        assert collected == sorted(ids, reverse=order == "desc")
@@ -0,0 +1,59 @@
+# app/tests/test_metrics.py
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.main import app
+from app.request_metrics import RequestMetricsMiddleware, registry
+
+
+@pytest.fixture
+def metrics_client(client, monkeypatch):
+    """The app wrapped in the timing middleware, as main.py does with REQUEST_METRICS=true."""
+    monkeypatch.setattr(settings, "REQUEST_METRICS", True)
+    registry.clear()
+    with TestClient(RequestMetricsMiddleware(app)) as c:
+        yield c
+    registry.clear()
+
+
+def test_server_timing_counts_sql_statements(metrics_client, admin_token):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    resp = metrics_client.get("/employees/list?limit=5", headers=headers)
+    assert resp.status_code == 200
+    timing = resp.headers["server-timing"]
+    assert timing.startswith("app;dur=")
+    queries = int(timing.split('desc="')[1].split(" ")[0])
+    assert queries >= 1
+
+
+def test_prometheus_metrics_by_route_template(metrics_client, admin_token):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    metrics_client.get("/leave/list", headers=headers)
+    metrics_client.get("/leave/999999/approve", headers=headers)  # path params collapse into the template
+
+    resp = metrics_client.get("/metrics", headers=headers)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    body = resp.text
+    assert 'http_request_duration_seconds_count{method="GET",route="/leave/list",status="200"} 1' in body
+    assert 'route="/leave/{leave_id}/approve"' in body
+    assert "/leave/999999" not in body
+    assert 'http_request_sql_statements_count{method="GET",route="/leave/list"} 1' in body
+    assert 'db_pool_checkouts_total{engine="sync"}' in body
+
+
+def test_metrics_endpoint_auth(metrics_client, create_employee, monkeypatch):
+    assert metrics_client.get("/metrics").status_code == 401
+    emp = create_employee(email="metricsemp@example.com", password="p")
+    token = metrics_client.post("/auth/login", data={"username": emp["email"], "password": "p"}).json()["access_token"]
+    assert metrics_client.get("/metrics", headers={"Authorization": f"Bearer {token}"}).status_code == 403
+
+    monkeypatch.setattr(settings, "METRICS_SCRAPE_TOKEN", "scrape-secret")
+    assert metrics_client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"}).status_code == 200
+
+
+def test_metrics_endpoint_hidden_when_disabled(client, admin_token):
+    resp = client.get("/metrics", headers={"Authorization": f"Bearer {admin_token}"})
+    assert resp.status_code == 404
+    assert "server-timing" not in resp.headers
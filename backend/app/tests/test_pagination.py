@@ -1,6 +1,6 @@
 # app/tests/test_pagination.py
 import json
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
 
 def test_employees_pagination_and_search(client, admin_token, create_employee, db_session):
     headers = {"Authorization": f"Bearer {admin_token}"}
@@ -67,3 +67,67 @@ def test_attendance_pagination_and_date_filter(client, admin_token, create_emplo
     # check dates in returned items are within range
     for it in d2["items"]:
         assert it["date"] >= s_date and it["date"] <= e_date
+
+def test_attendance_cursor_pagination(client, admin_token, create_employee, db_session):
+    emp = create_employee(email="attcursor@example.com", password="pass", first="AttCursor", last="User")
+    import app.models as models
+    base_date = date.today()
+    for i in range(7):
+        ar = models.AttendanceRecord(
+            employee_id=emp["id"],
+            date=base_date - timedelta(days=i),
+            # leave some check-ins empty so NULL handling is exercised
+            check_in_time=None if i % 3 == 0 else datetime(2026, 1, 1, 9, i),
+            status="PRESENT"
+        )
+        db_session.add(ar)
+    db_session.commit()
+
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    for sort in ("date", "check_in_time"):
+        url = f"/attendance/list?employee_id={emp['id']}&sort_by={sort}&order=asc&limit=3"
+        full = client.get(url.replace("limit=3", "limit=100"), headers=headers).json()
+        expected = [it["id"] for it in full["items"]]
+        assert len(expected) == 7
+
+        # walk forward by cursor
+        seen, pages, cursor = [], [], None
+        while True:
+            r = client.get(url + (f"&cursor={cursor}" if cursor else ""), headers=headers)
+            assert r.status_code == 200
+            d = r.json()
+            if cursor:
+                assert d["total"] is None
+            pages.append(d)
+            seen += [it["id"] for it in d["items"]]
+            cursor = d["next_cursor"]
+            if not cursor:
+                break
+        assert seen == expected
+
+        # and back again from the last page
+        back = client.get(url + f"&cursor={pages[-1]['prev_cursor']}", headers=headers).json()
+        assert [it["id"] for it in back["items"]] == [it["id"] for it in pages[-2]["items"]]
+
+    # cursor issued for another sort column is rejected
+    r = client.get(f"/attendance/list?employee_id={emp['id']}&sort_by=date&cursor={pages[0]['next_cursor']}", headers=headers)
+    assert r.status_code == 400
+
+def test_employees_ranked_search(client, admin_token, create_employee):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    create_employee(email="rahul.sharma@example.com", password="p", first="Rahul", last="Sharma")
+    create_employee(email="rahul.verma@example.com", password="p", first="Rahul", last="Verma")
+
+    r = client.get("/employees/list?q=rah&search_mode=ranked", headers=headers)
+    assert r.status_code == 200
+    emails = {it["email"] for it in r.json()["items"]}
+    assert {"rahul.sharma@example.com", "rahul.verma@example.com"} <= emails
+
+    # every word has to match
+    r2 = client.get("/employees/list?q=rahul%20sharm&search_mode=ranked", headers=headers)
+    d2 = r2.json()
+    assert d2["total"] == 1
+    assert d2["items"][0]["email"] == "rahul.sharma@example.com"
+
+    r3 = client.get("/employees/list?q=rahul&search_mode=fuzzy", headers=headers)
+    assert r3.status_code == 400
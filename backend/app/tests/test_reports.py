@@ -0,0 +1,57 @@
+# app/tests/test_reports.py
+from datetime import date, datetime
+
+def get_token_for(client, email, password):
+    resp = client.post("/auth/login", data={"username": email, "password": password})
+    assert resp.status_code == 200
+    return resp.json()["access_token"]
+
+def test_summaries_follow_checkout_and_backfill(client, admin_token, create_employee, db_session):
+    import app.models as models
+    from app.summaries import backfill
+
+    emp = create_employee(email="report@example.com", password="p", first="Report", last="User")
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    events = [
+        {"employee_id": emp["id"], "timestamp": "2026-04-01T09:00:00", "direction": "in"},
+        {"employee_id": emp["id"], "timestamp": "2026-04-01T17:00:00", "direction": "out"},
+        {"employee_id": emp["id"], "timestamp": "2026-04-02T10:00:00", "direction": "in"},
+        {"employee_id": emp["id"], "timestamp": "2026-04-02T12:30:00", "direction": "out"},
+    ]
+    assert client.post("/attendance/bulk", headers=headers, json={"events": events}).json()["applied"] == 4
+
+    daily = client.get(f"/reports/daily?start_date=2026-04-01&end_date=2026-04-30&employee_id={emp['id']}", headers=headers).json()
+    assert [it["worked_seconds"] for it in daily["items"]] == [8 * 3600, 2 * 3600 + 1800]
+
+    url = f"/reports/monthly?year=2026&month=4&employee_id={emp['id']}"
+    monthly = client.get(url, headers=headers).json()["items"]
+    assert len(monthly) == 1
+    assert monthly[0]["present_days"] == 2
+    assert monthly[0]["late_days"] == 1
+    assert monthly[0]["worked_seconds"] == 10 * 3600 + 1800
+
+    # history written behind the API's back is picked up by the backfill
+    db_session.add(models.AttendanceRecord(employee_id=emp["id"], date=date(2026, 4, 3), status="ABSENT"))
+    db_session.add(models.AttendanceRecord(
+        employee_id=emp["id"], date=date(2026, 4, 6), status="PRESENT",
+        check_in_time=datetime(2026, 4, 6, 9, 0), check_out_time=datetime(2026, 4, 6, 10, 0),
+    ))
+    db_session.commit()
+    backfill(db_session, date(2026, 4, 1), date(2026, 4, 30))
+
+    rebuilt = client.get(url, headers=headers).json()["items"][0]
+    assert rebuilt["present_days"] == 3
+    assert rebuilt["absent_days"] == 1
+    assert rebuilt["worked_seconds"] == 11 * 3600 + 1800
+
+def test_reports_scoped_to_employee(client, create_employee):
+    emp = create_employee(email="reportscope@example.com", password="p", first="Scope", last="User")
+    token = get_token_for(client, emp["email"], emp["password"])
+    headers = {"Authorization": f"Bearer {token}"}
+    client.post("/attendance/check-in", headers=headers)
+    client.post("/attendance/check-out", headers=headers)
+
+    today = date.today()
+    r = client.get(f"/reports/monthly?year={today.year}&month={today.month}&employee_id=1", headers=headers)
+    assert r.status_code == 200
+    assert [it["employee_id"] for it in r.json()["items"]] == [emp["id"]]
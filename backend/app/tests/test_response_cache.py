@@ -0,0 +1,128 @@
+# app/tests/test_response_cache.py
+from datetime import date, timedelta
+
+import pytest
+
+from app import holiday_calendar, response_cache
+from app.response_cache import MemoryBackend, RedisBackend
+
+
+class FakeRedis:
+    """Stand-in for redis.Redis: just the calls RedisBackend makes."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1).encode()
+
+
+@pytest.fixture(params=["memory", "redis"])
+def cache_backend(request):
+    backend = MemoryBackend(maxsize=100, ttl=60) if request.param == "memory" else RedisBackend(FakeRedis(), ttl=60)
+    response_cache.set_backend(backend)
+    yield backend
+    response_cache.set_backend(None)
+    holiday_calendar.invalidate()
+
+
+def _login(client, email, password):
+    token = client.post("/auth/login", data={"username": email, "password": password}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_employee_list_cached_until_create(client, admin_token, cache_backend):
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    url = "/employees/list?limit=500&sort_by=email"
+    first = client.get(url, headers=headers)
+    assert first.headers["x-cache"] == "MISS"
+    again = client.get(url, headers=headers)
+    assert again.headers["x-cache"] == "HIT"
+    assert again.json() == first.json()
+
+    email = f"cached-{cache_backend.__class__.__name__.lower()}@example.com"
+    resp = client.post("/employees/create", headers=headers, json={
+        "first_name": "Cache", "last_name": "Miss", "email": email, "password": "p",
+        "department_id": 1, "role": "employee",
+    })
+    assert resp.status_code == 200
+    after = client.get(url, headers=headers)
+    assert after.headers["x-cache"] == "MISS"
+    assert email in [e["email"] for e in after.json()["items"]]
+
+    detail = client.get(f"/employees/{resp.json()['id']}", headers=headers)
+    assert detail.json()["email"] == email
+    assert client.get(f"/employees/{resp.json()['id']}", headers=headers).headers["x-cache"] == "HIT"
+
+
+def test_cache_scoped_by_caller(client, admin_token, create_employee, cache_backend):
+    suffix = cache_backend.__class__.__name__.lower()
+    emp = create_employee(email=f"scoped-{suffix}@example.com", password="p", first="Scoped", last="Emp")
+    emp_headers = _login(client, emp["email"], "p")
+    admin_headers = {"Authorization": f"Bearer {admin_token}"}
+
+    mine = client.get("/employees/list", headers=emp_headers).json()
+    assert [e["id"] for e in mine["items"]] == [emp["id"]]
+    everyone = client.get("/employees/list", headers=admin_headers)
+    assert everyone.headers["x-cache"] == "MISS"
+    assert everyone.json()["total"] > 1
+
+
+def test_leave_list_invalidated_by_writes(client, admin_token, create_employee, cache_backend):
+    suffix = cache_backend.__class__.__name__.lower()
+    emp = create_employee(email=f"cacheleave-{suffix}@example.com", password="p", first="Cache", last="Leave")
+    emp_headers = _login(client, emp["email"], "p")
+    admin_headers = {"Authorization": f"Bearer {admin_token}"}
+    url = f"/leave/list?employee_id={emp['id']}"
+
+    assert client.get(url, headers=admin_headers).json()["total"] == 0
+    assert client.get(url, headers=admin_headers).headers["x-cache"] == "HIT"
+
+    start = date.today() + timedelta(days=60)
+    leave = client.post("/leave/apply", headers=emp_headers, json={
+        "leave_type_id": 1, "start_date": start.isoformat(), "end_date": start.isoformat(),
+    }).json()
+    listed = client.get(url, headers=admin_headers).json()
+    assert [i["status"] for i in listed["items"]] == ["PENDING"]
+
+    assert client.put(f"/leave/{leave['id']}/reject", headers=admin_headers).status_code == 200
+    assert [i["status"] for i in client.get(url, headers=admin_headers).json()["items"]] == ["REJECTED"]
+
+
+def test_shared_backend_invalidates_other_workers(client, admin_token, db_session):
+    from app import models
+
+    # two workers, each with its own backend object, sharing one Redis
+    shared = FakeRedis()
+    worker_a, worker_b = RedisBackend(shared, ttl=60), RedisBackend(shared, ttl=60)
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    try:
+        response_cache.set_backend(worker_a)
+        client.get("/employees/list?limit=3", headers=headers)
+        assert client.get("/employees/list?limit=3", headers=headers).headers["x-cache"] == "HIT"
+        holidays_before = client.get("/holidays/list").json()
+
+        # worker B writes: a holiday row plus the invalidation create_holiday does
+        db_session.add(models.Holiday(name="Other worker", date=date(2031, 1, 2)))
+        db_session.commit()
+        response_cache.set_backend(worker_b)
+        response_cache.invalidate(response_cache.EMPLOYEES, response_cache.HOLIDAYS)
+
+        # worker A never cleared its own caches, yet serves fresh data
+        response_cache.set_backend(worker_a)
+        assert client.get("/employees/list?limit=3", headers=headers).headers["x-cache"] == "MISS"
+        assert len(client.get("/holidays/list").json()) == len(holidays_before) + 1
+    finally:
+        response_cache.set_backend(None)
+        holiday_calendar.invalidate()
+
+
+def test_disabled_by_default(client, admin_token):
+    resp = client.get("/employees/list", headers={"Authorization": f"Bearer {admin_token}"})
+    assert "x-cache" not in resp.headers
@@ -0,0 +1,67 @@
+# app/tests/test_slow_queries.py
+import json
+
+from fastapi.testclient import TestClient
+
+from app import slow_queries
+from app.config import settings
+from app.database import engine, get_async_engine
+from app.main import app
+from app.request_metrics import RequestScopeMiddleware
+
+
+def _lines(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_slow_statement_logged_with_params_and_plan(tmp_path):
+    from sqlalchemy import create_engine, text
+
+    eng = create_engine(f"sqlite:///{tmp_path / 'slow.db'}")
+    log = slow_queries.build_logger(str(tmp_path / "slow.log"), max_bytes=1_000_000, backups=1)
+    remove = slow_queries.install(eng, threshold_ms=0.000001, log=log)
+    with eng.begin() as conn:
+        conn.execute(text("CREATE TABLE t (id INTEGER PRIMARY KEY, password TEXT)"))
+        conn.execute(text("INSERT INTO t (password) VALUES (:password)"), {"password": "hunter2"})
+        conn.execute(text("SELECT * FROM t WHERE id = :id"), {"id": 1}).fetchall()
+    remove()
+    with eng.connect() as conn:
+        conn.execute(text("SELECT 1"))  # not logged any more
+    slow_queries.flush()
+
+    entries = _lines(tmp_path / "slow.log")
+    assert len(entries) == 3
+    insert, select = entries[1], entries[2]
+    assert insert["parameters"] == {"password": "***"}
+    assert "plan" not in insert  # only SELECTs get EXPLAINed
+    assert select["statement"].startswith("SELECT * FROM t")
+    assert select["parameters"] == {"id": 1}
+    assert select["route"] is None
+    assert any("t USING INTEGER PRIMARY KEY" in step for step in select["plan"])
+
+
+def test_log_file_rotates(tmp_path):
+    log = slow_queries.build_logger(str(tmp_path / "rot.log"), max_bytes=200, backups=2)
+    for i in range(20):
+        log.info(json.dumps({"n": i, "pad": "x" * 50}))
+    assert (tmp_path / "rot.log.1").exists()
+    assert not (tmp_path / "rot.log.3").exists()
+
+
+def test_route_recorded_for_request(client, admin_token, tmp_path):
+    # the statement's route comes from the request being served, on either engine
+    target = get_async_engine().sync_engine if settings.ASYNC_DB else engine
+    log = slow_queries.build_logger(str(tmp_path / "route.log"), max_bytes=1_000_000, backups=1)
+    remove = slow_queries.install(target, threshold_ms=0.000001, log=log)
+    try:
+        with TestClient(RequestScopeMiddleware(app)) as c:
+            resp = c.get("/employees/list?q=admin", headers={"Authorization": f"Bearer {admin_token}"})
+        assert resp.status_code == 200
+    finally:
+        remove()
+    slow_queries.flush()
+
+    entries = [e for e in _lines(tmp_path / "route.log") if "employees" in e["statement"]]
+    assert entries
+    assert all(e["route"] == "/employees/list" for e in entries)
+    assert all("plan" in e for e in entries), [e.get("explain_error") for e in entries]
@@ -0,0 +1,33 @@
+"""
+Move attendance_records older than the retention window into monthly Parquet
+files under ARCHIVE_DIR (needs pyarrow). Safe to re-run; meant for a monthly
+cron. On a partitioned table, run manage_partitions.py --detach-before
+afterwards to drop the emptied partitions.
+
+Usage:
+    python archive_attendance.py --list
+    python archive_attendance.py                # ARCHIVE_AFTER_MONTHS
+    python archive_attendance.py --months 12
+"""
+import argparse
+
+from app.archive import archive_older_than, archived_months, cutoff
+from app.config import settings
+from app.database import SessionLocal
+
+parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+parser.add_argument("--months", type=int, default=settings.ARCHIVE_AFTER_MONTHS,
+                    help=f"keep this many months before the current one in the table (default {settings.ARCHIVE_AFTER_MONTHS})")
+parser.add_argument("--list", action="store_true", help="only list the archived months")
+args = parser.parse_args()
+
+if args.list:
+    for year, month in archived_months():
+        print(f"{year:04d}-{month:02d}")
+else:
+    db = SessionLocal()
+    try:
+        result = archive_older_than(db, args.months)
+        print(f"archived {result['rows']} rows from {result['months']} months; cutoff is now {cutoff()}")
+    finally:
+        db.close()
@@ -0,0 +1,23 @@
+"""
+Rebuild the attendance summary tables from attendance_records.
+
+Usage:
+    python backfill_summaries.py --start 2025-01-01 --end 2025-12-31
+"""
+import argparse
+from datetime import date
+
+from app.database import SessionLocal
+from app.summaries import backfill
+
+parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+parser.add_argument("--start", type=date.fromisoformat, required=True, help="first day (YYYY-MM-DD)")
+parser.add_argument("--end", type=date.fromisoformat, default=date.today(), help="last day (YYYY-MM-DD), default today")
+args = parser.parse_args()
+
+db = SessionLocal()
+try:
+    backfill(db, args.start, args.end)
+    print(f"Rebuilt summaries for {args.start:%Y-%m} .. {args.end:%Y-%m}")
+finally:
+    db.close()
@@ -0,0 +1,56 @@
+"""
+Bulk-create employees from a CSV (header row: first_name, last_name, email,
+password, phone, designation, department_id, role) or NDJSON file, like
+POST /employees/import without the row limit. Passwords are hashed on
+--workers threads (bcrypt releases the GIL, so they use that many cores).
+Prints failed rows; --report writes the full per-row report as JSON.
+
+Usage:
+    python import_employees.py staff.csv
+    python import_employees.py staff.ndjson --dry-run
+    python import_employees.py export.txt --format csv --workers 8 --report report.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+from app.config import settings
+from app.database import SessionLocal
+from app.employee_import import format_for, import_employees
+
+parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+parser.add_argument("path", help="CSV or NDJSON file")
+parser.add_argument("--format", dest="fmt", choices=("csv", "ndjson"), help="default: from the file extension")
+parser.add_argument("--dry-run", action="store_true", help="validate and check conflicts, write nothing")
+parser.add_argument("--workers", type=int, default=os.cpu_count() or settings.PASSWORD_HASH_WORKERS,
+                    help="bcrypt threads (default: CPU count)")
+parser.add_argument("--report", help="write the per-row report to this JSON file")
+args = parser.parse_args()
+
+# the bcrypt pool is created on first use, so this takes effect
+settings.PASSWORD_HASH_WORKERS = args.workers
+
+fmt = args.fmt or format_for(args.path)
+if fmt is None:
+    sys.exit("cannot tell the format from the file name; pass --format csv|ndjson")
+with open(args.path, encoding="utf-8-sig") as f:
+    text = f.read()
+
+db = SessionLocal()
+try:
+    report = asyncio.run(import_employees(db, text, fmt, dry_run=args.dry_run))
+except ValueError as e:
+    sys.exit(str(e))
+finally:
+    db.close()
+
+for row in report["results"]:
+    if row["status"] == "failed":
+        print(f"line {row['line']}: {row['email'] or '-'}: {row['detail']}")
+if args.report:
+    with open(args.report, "w") as f:
+        json.dump(report, f, indent=2)
+verb = "valid" if args.dry_run else "created"
+print(f"{len(report['results']) - report['failed']} {verb}, {report['failed']} failed")
@@ -0,0 +1,44 @@
+"""
+Maintain the monthly partitions of attendance_records (PostgreSQL, after the
+partitioning migration). Run it from cron, e.g. daily:
+
+Usage:
+    python manage_partitions.py --list
+    python manage_partitions.py --ahead 3
+    python manage_partitions.py --ahead 3 --detach-before 2024-01 [--drop]
+
+--ahead creates partitions from the current month up to N months ahead.
+--detach-before detaches every month before YYYY-MM; the detached tables stay
+in the database (export or archive them, then drop) unless --drop is given.
+Does nothing on SQLite.
+"""
+import argparse
+
+from app.database import engine
+from app.partitions import detach_before, ensure_partitions, is_partitioned, list_partitions
+
+
+def year_month(value: str):
+    year, month = value.split("-")
+    return int(year), int(month)
+
+
+parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+parser.add_argument("--ahead", type=int, default=3, help="months to create past the current one (default 3)")
+parser.add_argument("--detach-before", type=year_month, help="detach partitions for months before YYYY-MM")
+parser.add_argument("--drop", action="store_true", help="drop detached partitions instead of keeping them")
+parser.add_argument("--list", action="store_true", help="only list the attached partitions")
+args = parser.parse_args()
+
+with engine.begin() as conn:
+    if not is_partitioned(conn):
+        print("attendance_records is not partitioned (SQLite, or migrations not applied); nothing to do")
+    elif args.list:
+        for year, month, name in list_partitions(conn):
+            print(f"{year:04d}-{month:02d}  {name}")
+    else:
+        for name in ensure_partitions(conn, args.ahead):
+            print(f"created {name}")
+        if args.detach_before:
+            for name in detach_before(conn, *args.detach_before, drop=args.drop):
+                print(f"{'dropped' if args.drop else 'detached'} {name}")
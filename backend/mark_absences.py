@@ -0,0 +1,27 @@
+"""
+Write ABSENT / ON_LEAVE / HOLIDAY attendance rows for weekdays without one,
+then rebuild the affected months' summaries. Safe to re-run; meant for a
+nightly cron (the default range is yesterday).
+
+Usage:
+    python mark_absences.py
+    python mark_absences.py --start 2025-01-01 --end 2025-01-31
+"""
+import argparse
+from datetime import date, timedelta
+
+from app.absences import fill_absences
+from app.database import SessionLocal
+
+yesterday = date.today() - timedelta(days=1)
+parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+parser.add_argument("--start", type=date.fromisoformat, default=yesterday, help="first day (YYYY-MM-DD), default yesterday")
+parser.add_argument("--end", type=date.fromisoformat, default=yesterday, help="last day (YYYY-MM-DD), default yesterday; capped at yesterday")
+args = parser.parse_args()
+
+db = SessionLocal()
+try:
+    result = fill_absences(db, args.start, args.end)
+    print(f"{result['inserted']} rows written for {result['days']} weekdays across {result['departments']} departments")
+finally:
+    db.close()